@@ -1,54 +1,99 @@
 #!/usr/bin/env python3
 """
 Simple startup script for the Android Cluster Coordinator
+
+Set COORD_DASHBOARD_SOCKET to a path to serve the web dashboard on a UNIX
+socket (e.g. behind nginx, see nginx-dashboard.conf) instead of TCP port 8080.
+
+Set COORD_REUSE_PORT=1 to bind with SO_REUSEPORT, so a replacement coordinator
+can take over the ports while the old one drains. Off by default: each
+coordinator keeps its nodes and tasks in memory, so two of them silently
+sharing a port would split the cluster between unrelated states.
 """
 
 import asyncio
 import logging
-from server import coordinator
+import os
+import signal
+import socket
+from server import coordinator, sample_tasks, WS_SERVER_OPTIONS
 from web_dashboard import create_web_app
 import websockets
 from aiohttp import web
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import uvloop
+except ImportError:  # uvloop is not available on Windows
+    uvloop = None
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+REUSE_PORT = os.environ.get('COORD_REUSE_PORT') == '1' and hasattr(socket, 'SO_REUSEPORT')
+
 async def main():
     """Start both WebSocket server and web dashboard"""
     
-    # Start WebSocket server
+    # Size the default executor (used for DNS lookups and any blocking work
+    # pushed off the loop) to the host instead of cpu_count + 4 threads
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(ThreadPoolExecutor(
+        max_workers=os.cpu_count() or 1, thread_name_prefix='coord-worker'))
+    
+    # Start WebSocket server. With COORD_REUSE_PORT, SO_REUSEPORT lets a
+    # replacement coordinator bind while the old one drains.
     ws_server = await websockets.serve(
         coordinator.register_handler,
         '0.0.0.0',
-        8765
+        8765,
+        reuse_port=REUSE_PORT,
+        **WS_SERVER_OPTIONS
     )
     logger.info('✅ WebSocket server started on ws://0.0.0.0:8765')
     
     # Add sample tasks for testing
-    coordinator.add_task('prime_calculation', {'start': 1, 'end': 10000}, priority=2)
-    coordinator.add_task('matrix_multiplication', {'size': 100}, priority=1)
-    coordinator.add_task('hash_computation', {'iterations': 1000}, priority=1)
+    coordinator.add_tasks(sample_tasks())
     logger.info('📋 Added sample tasks to queue')
     
     # Start web dashboard
     app = await create_web_app()
-    runner = web.AppRunner(app)
+    runner = web.AppRunner(app, shutdown_timeout=5)
     await runner.setup()
-    site = web.TCPSite(runner, '0.0.0.0', 8080)
-    await site.start()
-    logger.info('✅ Web dashboard started on http://0.0.0.0:8080')
+    dashboard_socket = os.environ.get('COORD_DASHBOARD_SOCKET')
+    if dashboard_socket:
+        # Behind a local reverse proxy, skip the TCP stack entirely
+        site = web.UnixSite(runner, dashboard_socket, backlog=2048)
+        await site.start()
+        os.chmod(dashboard_socket, 0o660)
+        logger.info(f'✅ Web dashboard started on unix:{dashboard_socket}')
+    else:
+        # aiohttp already sets TCP_NODELAY on accepted connections; with
+        # COORD_REUSE_PORT a replacement coordinator can bind while this one drains.
+        site = web.TCPSite(runner, '0.0.0.0', 8080, backlog=2048,
+                           reuse_port=REUSE_PORT)
+        await site.start()
+        logger.info('✅ Web dashboard started on http://0.0.0.0:8080')
     
     logger.info('🚀 Android Cluster Coordinator is ready!')
     logger.info('📱 Connect your Android device to ws://YOUR_IP:8765')
     
-    # Keep running forever
+    # Run until SIGINT/SIGTERM, then shut both servers down cleanly
+    stop = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:  # Windows: fall back to KeyboardInterrupt
+            pass
+    
     try:
-        await asyncio.Future()  # run forever
-    except KeyboardInterrupt:
+        await stop.wait()
+    finally:
         logger.info('🛑 Shutting down cluster coordinator...')
         ws_server.close()
         await ws_server.wait_closed()
         await runner.cleanup()
 
 if __name__ == "__main__":
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     asyncio.run(main())
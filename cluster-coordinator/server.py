@@ -5,22 +5,171 @@ WebSocket server for managing Android compute nodes
 """
 
 import asyncio
+import heapq
+import itertools
 import websockets
-import json
+import orjson
+import msgpack
 import logging
+import logging.handlers
+import queue
+import atexit
 import time
 import subprocess
 import os
-from typing import Dict, List, Any, Optional
+import re
+import reprlib
+import hashlib
+import gzip
+import socket
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Iterable, Tuple, Set, Union, Callable
 from dataclasses import dataclass, asdict
+from enum import IntEnum
 from datetime import datetime
 import uuid
 from aiohttp import web, web_response
 import aiohttp_cors
 
-logging.basicConfig(level=logging.INFO)
+try:
+    import uvloop
+except ImportError:  # uvloop is not available on Windows
+    uvloop = None
+
+# Log through a queue so the event loop never blocks on writes to stderr;
+# a background listener thread does the actual I/O
+_log_queue = queue.SimpleQueue()
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+log_listener = logging.handlers.QueueListener(_log_queue, _log_handler)
+logging.getLogger().addHandler(logging.handlers.QueueHandler(_log_queue))
+logging.getLogger().setLevel(logging.INFO)
+log_listener.start()
+atexit.register(log_listener.stop)
+
 logger = logging.getLogger(__name__)
 
+# How long kubectl/sinfo node listings are reused by get_cluster_status
+CLUSTER_NODES_TTL = 2.0
+
+def expand_hostlist(hostlist: str) -> List[str]:
+    """Expand a SLURM hostlist such as 'node[01-03,07],gpu1' into host names"""
+    hosts = []
+    for part in re.findall(r'[^,\[]+(?:\[[^\]]*\])?[^,]*', hostlist):
+        match = re.match(r'(.*)\[([^\]]*)\](.*)$', part)
+        if not match:
+            hosts.append(part)
+            continue
+        prefix, ranges, suffix = match.groups()
+        for span in ranges.split(','):
+            low, _, high = span.partition('-')
+            for i in range(int(low), int(high or low) + 1):
+                hosts.append(f"{prefix}{i:0{len(low)}d}{suffix}")
+    return hosts
+
+def write_node_files(files: Dict[str, Tuple[str, int]]):
+    """Write {path: (content, mode)} node setup files; blocking, run in a thread"""
+    for path, (content, mode) in files.items():
+        with open(path, 'w') as f:
+            f.write(content)
+        os.chmod(path, mode)
+
+# Kubernetes Node manifest for an Android device, filled in per registration
+NODE_MANIFEST_TEMPLATE = b"""\
+apiVersion: v1
+kind: Node
+metadata:
+  name: {name}
+  labels:
+    node-type: android
+    cluster-role: compute
+    architecture: arm64
+spec:
+  taints:
+  - key: android-node
+    value: "true"
+    effect: NoSchedule
+status:
+  addresses:
+  - type: InternalIP
+    address: {ip}
+  - type: Hostname
+    address: {name}
+  nodeInfo:
+    architecture: arm64
+    operatingSystem: android
+  capacity:
+    cpu: "4"
+    memory: "4Gi"
+    pods: "10"
+  allocatable:
+    cpu: "3"
+    memory: "3Gi"
+    pods: "10"
+"""
+
+# Bounded repr for logging task results; never renders a whole large payload
+result_repr = reprlib.Repr()
+result_repr.maxstring = 100
+result_repr.maxother = 100
+result_repr.maxlist = result_repr.maxdict = 5
+result_repr.maxlevel = 3
+
+# Finished tasks (with their results) kept for /task and /tasks lookups
+FINISHED_TASKS_MAX = 10000
+
+# Single-byte binary heartbeat and its ack, handled ahead of decoding. They
+# cannot collide with real messages because those are always dicts: a lone
+# 0x01 is not valid JSON, and in msgpack it decodes to the integer 1, never to
+# a message dict.
+HEARTBEAT_FRAME = b'\x01'
+HEARTBEAT_ACK_FRAME = b'\x02'
+
+# Frames that may wait for a node's writer before the node is dropped
+OUTBOX_SIZE = 256
+
+def encode_json(message: Dict[str, Any]) -> str:
+    """Encode a message as a JSON text frame (what the Android app expects)"""
+    return orjson.dumps(message).decode()
+
+def encode_msgpack(message: Dict[str, Any]) -> bytes:
+    """Encode a message as a MessagePack binary frame"""
+    return msgpack.packb(message, use_bin_type=True)
+
+def decode_msgpack(frame: bytes) -> Dict[str, Any]:
+    """Decode a MessagePack binary frame"""
+    return msgpack.unpackb(frame, raw=False)
+
+# (encoder, decoder) per wire format. Clients opt into MessagePack by asking
+# for the "msgpack" WebSocket subprotocol; everyone else gets JSON text.
+WIRE_CODECS = {
+    "json": (encode_json, orjson.loads),
+    "msgpack": (encode_msgpack, decode_msgpack),
+}
+WIRE_SUBPROTOCOLS = ["msgpack", "json"]
+
+# websockets.serve options shared by every entry point. Task dispatch frames
+# are a few hundred bytes of JSON, so permessage-deflate only costs CPU.
+# Buffer limits and pings bound per-connection memory: a slow or dead
+# Android peer is dropped (and its tasks requeued) instead of buffering.
+WS_SERVER_OPTIONS = dict(
+    compression=None,
+    subprotocols=WIRE_SUBPROTOCOLS,
+    max_size=2**20,
+    max_queue=32,
+    write_limit=2**16,
+    ping_interval=20,
+    ping_timeout=20,
+    close_timeout=5,
+)
+
+class TaskPriority(IntEnum):
+    """Task priorities; higher values are dispatched first"""
+    LOW = 0
+    NORMAL = 1
+    HIGH = 2
+
 @dataclass
 class ComputeNode:
     node_id: str
@@ -37,12 +186,22 @@ class ComputeNode:
         if self.capabilities is None:
             self.capabilities = []
 
+@dataclass(eq=False)
+class NodeSession:
+    """A node's live WebSocket connection, wire codec and outbound queue"""
+    node_id: str
+    websocket: Any
+    codec: str
+    outbox: asyncio.Queue
+    # Set once the outbox overflowed and the connection is being closed
+    closing: bool = False
+
 @dataclass
 class ComputeTask:
     task_id: str
     task_type: str
     data: Dict[str, Any]
-    priority: int = 1
+    priority: int = TaskPriority.NORMAL
     created_at: float = 0
     assigned_to: str = None
     status: str = "pending"
@@ -55,12 +214,57 @@ class ComputeTask:
 class ClusterCoordinator:
     def __init__(self):
         self.nodes: Dict[str, ComputeNode] = {}
+        # asdict() of each node for /status, dropped whenever the node changes;
+        # last_seen is refreshed on read so heartbeats never invalidate it
+        self.node_snapshots: Dict[str, Dict[str, Any]] = {}
         self.tasks: Dict[str, ComputeTask] = {}
-        self.task_queue: List[str] = []
-        self.connections: Dict[str, websockets.WebSocketServerProtocol] = {}
-        self.kubernetes_available = self.check_kubernetes_cluster()
-        self.slurm_available = self.check_slurm_cluster()
-        self.munge_available = self.check_munge_service()
+        # Most recently finished tasks, oldest evicted past FINISHED_TASKS_MAX
+        self.finished_tasks: OrderedDict[str, ComputeTask] = OrderedDict()
+        # asdict() of each task for /task and /tasks, dropped on status changes
+        self.task_snapshots: Dict[str, Dict[str, Any]] = {}
+        # Callbacks run on node/task state changes; must not block
+        self.status_listeners: List[Callable[[], None]] = []
+        # Heap of (-priority, seq, task_id): highest priority first, FIFO within
+        # a priority; the unique seq means task ids are never compared
+        self.task_queue: List[Tuple[int, int, str]] = []
+        self.task_seq = itertools.count()
+        # Each active task's seq, reused when it is requeued so a node dropping
+        # out does not move its tasks behind later ones of the same priority
+        self.task_order: Dict[str, int] = {}
+        # Pre-encoded task_assignment frames per codec; JSON is built when the
+        # task is added since that is what the Android app speaks
+        self.assignment_frames: Dict[str, Dict[str, Union[str, bytes]]] = {}
+        self.idle_nodes: Set[str] = set()
+        # Tasks handed to each node that have not reported a result yet
+        self.in_flight: Dict[str, Set[str]] = {}
+        # Running totals so status polls need not scan tasks and nodes
+        self.completed_count = 0
+        self.failed_count = 0
+        self.k8s_registered_count = 0
+        self.slurm_registered_count = 0
+        # Connected nodes; each session's outbox is drained by its writer task
+        self.sessions: Dict[str, NodeSession] = {}
+        # (monotonic time, nodes) of the last kubectl/sinfo listing
+        self.k8s_nodes_cache: Tuple[float, List[Dict[str, Any]]] = (float('-inf'), [])
+        self.slurm_nodes_cache: Tuple[float, List[Dict[str, Any]]] = (float('-inf'), [])
+        # Message type -> handler jump table used by handle_message
+        self.message_handlers = {
+            "heartbeat": self.handle_heartbeat,
+            "capabilities": self.handle_capabilities,
+            "task_result": self.handle_task_result,
+            "performance_update": self.handle_performance_update,
+            "request_task": self.handle_request_task,
+        }
+        
+        # Probe the clusters in parallel; each check can block for seconds on
+        # a timeout, and they run before the servers can start
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            kubernetes = pool.submit(self.check_kubernetes_cluster)
+            slurm = pool.submit(self.check_slurm_cluster)
+            munge = pool.submit(self.check_munge_service)
+        self.kubernetes_available = kubernetes.result()
+        self.slurm_available = slurm.result()
+        self.munge_available = munge.result()
         
         if self.kubernetes_available:
             logger.info("✅ Kubernetes cluster detected - Android nodes will be auto-registered")
@@ -76,29 +280,42 @@ class ClusterCoordinator:
         node_ip = websocket.remote_address[0]
         node_id = f"android-{node_ip.replace('.', '-')}"
         
-        logger.info(f"Node {node_id} connecting from {node_ip}")
+        codec = websocket.subprotocol if websocket.subprotocol in WIRE_CODECS else "json"
+        decode = WIRE_CODECS[codec][1]
+        
+        logger.info(f"Node {node_id} connecting from {node_ip} ({codec})")
+        
+        # Heartbeats and acks are tiny; send them without Nagle delays
+        sock = websocket.transport.get_extra_info('socket')
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        
+        session = NodeSession(node_id, websocket, codec, asyncio.Queue(maxsize=OUTBOX_SIZE))
+        writer = asyncio.create_task(self.write_frames(session))
         
         try:
             # Register the node
-            self.connections[node_id] = websocket
+            self.sessions[node_id] = session
             
-            if node_id not in self.nodes:
-                self.nodes[node_id] = ComputeNode(
+            node = self.nodes.get(node_id)
+            if node is None:
+                node = self.nodes[node_id] = ComputeNode(
                     node_id=node_id,
                     ip_address=node_ip,
                     status="connected",
                     last_seen=time.time()
                 )
             else:
-                self.nodes[node_id].status = "connected"
-                self.nodes[node_id].last_seen = time.time()
+                node.status = "connected"
+                node.last_seen = time.time()
+            self.invalidate_node(node_id)
             
             # Send welcome message
-            await websocket.send(json.dumps({
+            self.send_to_node(node_id, {
                 "type": "welcome",
                 "node_id": node_id,
                 "message": "Connected to cluster coordinator"
-            }))
+            })
             
             # Auto-register to existing clusters
             await self.auto_register_to_clusters(node_id)
@@ -108,39 +325,93 @@ class ClusterCoordinator:
             
             # Handle messages from this node
             async for message in websocket:
-                await self.handle_message(node_id, json.loads(message))
+                if message == HEARTBEAT_FRAME:
+                    # Binary heartbeat: no decode, no dict, one-byte ack
+                    node.last_seen = time.time()
+                    self.queue_frame(session, HEARTBEAT_ACK_FRAME)
+                    continue
+                await self.handle_message(node_id, decode(message))
                 
         except websockets.exceptions.ConnectionClosed:
             logger.info(f"Node {node_id} disconnected")
         except Exception as e:
             logger.error(f"Error handling node {node_id}: {e}")
         finally:
-            # Clean up
-            if node_id in self.connections:
-                del self.connections[node_id]
-            if node_id in self.nodes:
-                self.nodes[node_id].status = "disconnected"
+            # Clean up, unless the node has already reconnected on a newer
+            # session that now owns its state and in-flight tasks
+            writer.cancel()
+            if self.sessions.get(node_id) is session:
+                del self.sessions[node_id]
+                self.idle_nodes.discard(node_id)
+                await self.requeue_node_tasks(node_id)
+                node = self.nodes.get(node_id)
+                if node is not None:
+                    node.status = "disconnected"
+                    self.invalidate_node(node_id)
+    
+    def invalidate_node(self, node_id: str):
+        """Drop a node's cached status snapshot after one of its fields changed"""
+        self.node_snapshots.pop(node_id, None)
+        self.notify_status_listeners()
+    
+    def invalidate_task(self, task_id: str):
+        """Drop a task's cached snapshot after its status changed"""
+        self.task_snapshots.pop(task_id, None)
+        self.notify_status_listeners()
+    
+    def notify_status_listeners(self):
+        """Tell status listeners (e.g. dashboard push) that cluster state changed"""
+        for listener in self.status_listeners:
+            listener()
+    
+    def get_node_snapshots(self) -> Dict[str, Dict[str, Any]]:
+        """asdict() of every node, rebuilt only for nodes that changed"""
+        snapshots = {}
+        for node_id, node in self.nodes.items():
+            snapshot = self.node_snapshots.get(node_id)
+            if snapshot is None:
+                snapshot = self.node_snapshots[node_id] = asdict(node)
+            snapshot["last_seen"] = node.last_seen
+            snapshots[node_id] = snapshot
+        return snapshots
     
     async def handle_message(self, node_id: str, message: Dict[str, Any]):
         """Process messages from Android nodes"""
-        msg_type = message.get("type")
-        
-        if msg_type == "heartbeat":
-            self.nodes[node_id].last_seen = time.time()
-            await self.send_to_node(node_id, {"type": "heartbeat_ack"})
-            
-        elif msg_type == "capabilities":
-            self.nodes[node_id].capabilities = message.get("capabilities", [])
-            logger.info(f"Node {node_id} capabilities: {self.nodes[node_id].capabilities}")
-            
-        elif msg_type == "task_result":
-            await self.handle_task_result(node_id, message)
-            
-        elif msg_type == "performance_update":
-            self.nodes[node_id].performance_score = message.get("score", 0.0)
-            
-        elif msg_type == "request_task":
-            await self.assign_task(node_id)
+        handler = self.message_handlers.get(message.get("type"), self.handle_unknown)
+        await handler(node_id, message)
+    
+    async def handle_unknown(self, node_id: str, message: Dict[str, Any]):
+        """Ignore message types the coordinator does not act on"""
+        logger.debug(f"Ignoring {message.get('type')!r} message from {node_id}")
+    
+    async def handle_heartbeat(self, node_id: str, message: Dict[str, Any]):
+        """Record node liveness and acknowledge"""
+        node = self.nodes.get(node_id)
+        if node is None:
+            return
+        node.last_seen = time.time()
+        self.send_to_node(node_id, {"type": "heartbeat_ack"})
+    
+    async def handle_capabilities(self, node_id: str, message: Dict[str, Any]):
+        """Store the capabilities a node advertises"""
+        node = self.nodes.get(node_id)
+        if node is None:
+            return
+        node.capabilities = message.get("capabilities", [])
+        self.invalidate_node(node_id)
+        logger.info(f"Node {node_id} capabilities: {node.capabilities}")
+    
+    async def handle_performance_update(self, node_id: str, message: Dict[str, Any]):
+        """Store a node's latest performance score"""
+        node = self.nodes.get(node_id)
+        if node is None:
+            return
+        node.performance_score = message.get("score", 0.0)
+        self.invalidate_node(node_id)
+    
+    async def handle_request_task(self, node_id: str, message: Dict[str, Any]):
+        """Assign the next queued task to a node asking for work"""
+        await self.assign_task(node_id)
     
     async def handle_task_result(self, node_id: str, message: Dict[str, Any]):
         """Handle completed task results"""
@@ -148,16 +419,30 @@ class ClusterCoordinator:
         result = message.get("result")
         success = message.get("success", True)
         
-        if task_id in self.tasks:
-            task = self.tasks[task_id]
+        task = self.get_task(task_id)
+        if task is not None:
+            if task.status not in ("completed", "failed"):
+                if success:
+                    self.completed_count += 1
+                else:
+                    self.failed_count += 1
             task.status = "completed" if success else "failed"
             task.result = result
+            self.invalidate_task(task_id)
+            self.assignment_frames.pop(task_id, None)
+            self.in_flight.get(task.assigned_to, set()).discard(task_id)
+            self.retire_task(task)
             
-            self.nodes[node_id].tasks_completed += 1
-            logger.info(f"✅ Task {task_id} ({task.task_type}) completed by {node_id} - Result: {str(result)[:100]}...")
+            node = self.nodes.get(node_id)
+            if node is not None:
+                node.tasks_completed += 1
+                self.invalidate_node(node_id)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("✅ Task %s (%s) completed by %s - Result: %s",
+                            task_id, task.task_type, node_id, result_repr.repr(result))
             
             # Send acknowledgment
-            await self.send_to_node(node_id, {
+            self.send_to_node(node_id, {
                 "type": "task_ack",
                 "task_id": task_id,
                 "status": "received"
@@ -165,63 +450,193 @@ class ClusterCoordinator:
     
     async def assign_task(self, node_id: str):
         """Assign a task to a specific node"""
+        # Drop requeued entries whose tasks finished meanwhile
+        while self.task_queue:
+            task = self.tasks.get(self.task_queue[0][2])
+            if task is not None and task.status == "pending":
+                break
+            heapq.heappop(self.task_queue)
+        
         if not self.task_queue:
-            await self.send_to_node(node_id, {
+            # Remember the node so new tasks go straight to it
+            self.idle_nodes.add(node_id)
+            self.send_to_node(node_id, {
                 "type": "no_tasks",
                 "message": "No tasks available"
             })
             return
         
-        # Get the next task
-        task_id = self.task_queue.pop(0)
-        task = self.tasks[task_id]
+        self.idle_nodes.discard(node_id)
+        
+        # Take the pending task the loop above stopped on
+        _, _, task_id = heapq.heappop(self.task_queue)
         
         # Assign to node
         task.assigned_to = node_id
         task.status = "assigned"
+        self.invalidate_task(task_id)
+        self.in_flight.setdefault(node_id, set()).add(task_id)
         
         # Send task to node
         logger.info(f"📤 Assigning task {task_id} ({task.task_type}) to {node_id}")
-        await self.send_to_node(node_id, {
-            "type": "task_assignment",
-            "task_id": task_id,
-            "task_type": task.task_type,
-            "data": task.data,
-            "priority": task.priority
-        })
+        session = self.sessions.get(node_id)
+        if session is not None:
+            self.queue_frame(session, self.assignment_frame(task_id, session.codec))
         
         logger.info(f"Assigned task {task_id} to {node_id}")
     
-    async def send_to_node(self, node_id: str, message: Dict[str, Any]):
-        """Send message to a specific node"""
-        if node_id in self.connections:
+    async def requeue_node_tasks(self, node_id: str):
+        """Put tasks held by a disconnected node back on the queue"""
+        task_ids = self.in_flight.pop(node_id, set())
+        if not task_ids:
+            return
+        
+        for task_id in task_ids:
+            task = self.tasks[task_id]
+            task.assigned_to = None
+            task.status = "pending"
+            self.invalidate_task(task_id)
+        self._enqueue(task_ids)
+        
+        logger.info(f"Requeued {len(task_ids)} unfinished tasks from {node_id}")
+        await self.dispatch_to_idle_nodes()
+    
+    async def dispatch_to_idle_nodes(self):
+        """Hand queued tasks to nodes that are waiting for work"""
+        while self.task_queue and self.idle_nodes:
+            await self.assign_task(self.idle_nodes.pop())
+    
+    def send_to_node(self, node_id: str, message: Dict[str, Any]):
+        """Queue a message for a specific node"""
+        session = self.sessions.get(node_id)
+        if session is not None:
+            self.queue_frame(session, WIRE_CODECS[session.codec][0](message))
+    
+    def queue_frame(self, session: NodeSession, frame: Union[str, bytes]):
+        """Queue an already-encoded message on a node session"""
+        if session.closing:
+            return  # Already being dropped; later frames go nowhere
+        try:
+            session.outbox.put_nowait(frame)
+        except asyncio.QueueFull:
+            # The node is not reading; drop it rather than buffer without bound.
+            # register_handler then requeues its tasks.
+            session.closing = True
+            logger.error(f"Outbox for {session.node_id} is full, closing connection")
+            asyncio.ensure_future(session.websocket.close(1013, "Outbox full"))
+    
+    async def write_frames(self, session: NodeSession):
+        """Send a node's queued frames in order; one writer task per connection"""
+        while True:
+            frame = await session.outbox.get()
             try:
-                await self.connections[node_id].send(json.dumps(message))
+                await session.websocket.send(frame)
+            except websockets.exceptions.ConnectionClosed:
+                return
             except Exception as e:
-                logger.error(f"Failed to send message to {node_id}: {e}")
+                logger.error(f"Failed to send message to {session.node_id}: {e}")
     
-    async def broadcast(self, message: Dict[str, Any]):
+    def broadcast(self, message: Dict[str, Any]):
         """Broadcast message to all connected nodes"""
-        for node_id in list(self.connections.keys()):
-            await self.send_to_node(node_id, message)
+        # Encode once per wire format; each node's writer sends independently
+        frames: Dict[str, Union[str, bytes]] = {}
+        for session in self.sessions.values():
+            frame = frames.get(session.codec)
+            if frame is None:
+                frame = frames[session.codec] = WIRE_CODECS[session.codec][0](message)
+            self.queue_frame(session, frame)
     
-    def add_task(self, task_type: str, data: Dict[str, Any], priority: int = 1) -> str:
-        """Add a new task to the queue"""
+    def get_task(self, task_id: str) -> Optional[ComputeTask]:
+        """Look up an active or recently finished task"""
+        task = self.tasks.get(task_id)
+        if task is None:
+            task = self.finished_tasks.get(task_id)
+        return task
+    
+    def retire_task(self, task: ComputeTask):
+        """Move a finished task out of the active table into the bounded history"""
+        self.tasks.pop(task.task_id, None)
+        self.task_order.pop(task.task_id, None)
+        self.finished_tasks[task.task_id] = task
+        self.finished_tasks.move_to_end(task.task_id)
+        while len(self.finished_tasks) > FINISHED_TASKS_MAX:
+            evicted_id, _ = self.finished_tasks.popitem(last=False)
+            self.task_snapshots.pop(evicted_id, None)
+    
+    def get_task_snapshot(self, task: ComputeTask) -> Dict[str, Any]:
+        """asdict() of a task, rebuilt only after its status changes"""
+        snapshot = self.task_snapshots.get(task.task_id)
+        if snapshot is None:
+            snapshot = self.task_snapshots[task.task_id] = asdict(task)
+        return snapshot
+    
+    def get_task_snapshots(self) -> Dict[str, Dict[str, Any]]:
+        """Snapshots of recently finished and active tasks, keyed by task id"""
+        snapshots = {tid: self.get_task_snapshot(task) for tid, task in self.finished_tasks.items()}
+        snapshots.update((tid, self.get_task_snapshot(task)) for tid, task in self.tasks.items())
+        return snapshots
+    
+    def _create_task(self, task_type: str, data: Dict[str, Any], priority: int) -> str:
+        """Create a task record without queueing it"""
         task_id = str(uuid.uuid4())
-        task = ComputeTask(
+        self.tasks[task_id] = ComputeTask(
             task_id=task_id,
             task_type=task_type,
             data=data,
             priority=priority
         )
-        
-        self.tasks[task_id] = task
-        self.task_queue.append(task_id)
-        self.task_queue.sort(key=lambda tid: self.tasks[tid].priority, reverse=True)
+        self.assignment_frames[task_id] = {"json": encode_json(self.assignment_message(task_id))}
+        return task_id
+    
+    def assignment_message(self, task_id: str) -> Dict[str, Any]:
+        """Build the task_assignment message for a task"""
+        task = self.tasks[task_id]
+        return {
+            "type": "task_assignment",
+            "task_id": task_id,
+            "task_type": task.task_type,
+            "data": task.data,
+            "priority": task.priority
+        }
+    
+    def assignment_frame(self, task_id: str, codec: str) -> Union[str, bytes]:
+        """Return a task's encoded task_assignment frame, encoding once per codec"""
+        frames = self.assignment_frames[task_id]
+        if codec not in frames:
+            frames[codec] = WIRE_CODECS[codec][0](self.assignment_message(task_id))
+        return frames[codec]
+    
+    def _enqueue(self, task_ids: Iterable[str]):
+        """Push task ids onto the priority queue"""
+        for task_id in task_ids:
+            seq = self.task_order.get(task_id)
+            if seq is None:
+                seq = self.task_order[task_id] = next(self.task_seq)
+            heapq.heappush(self.task_queue, (-self.tasks[task_id].priority, seq, task_id))
+    
+    def add_task(self, task_type: str, data: Dict[str, Any],
+                 priority: int = TaskPriority.NORMAL) -> str:
+        """Add a new task to the queue"""
+        task_id = self._create_task(task_type, data, priority)
+        self._enqueue([task_id])
+        self.notify_status_listeners()
         
         logger.info(f"Added task {task_id} of type {task_type}")
         return task_id
     
+    def add_tasks(self, specs: Iterable[Tuple[str, Dict[str, Any], int]]) -> List[str]:
+        """Add several (task_type, data, priority) tasks at once"""
+        # Consume the specs before touching any state, so a bad one leaves no
+        # half-created tasks behind
+        specs = list(specs)
+        task_ids = [self._create_task(task_type, data, priority)
+                    for task_type, data, priority in specs]
+        self._enqueue(task_ids)
+        self.notify_status_listeners()
+        
+        logger.info(f"Added {len(task_ids)} tasks")
+        return task_ids
+    
     def check_kubernetes_cluster(self) -> bool:
         """Check if Kubernetes cluster is available on this host"""
         try:
@@ -285,8 +700,10 @@ class ClusterCoordinator:
             success = await self.register_to_kubernetes(node_id)
             if success:
                 node.kubernetes_registered = True
+                self.invalidate_node(node_id)
+                self.k8s_registered_count += 1
                 logger.info(f"✅ Node {node_id} registered to Kubernetes cluster")
-                await self.send_to_node(node_id, {
+                self.send_to_node(node_id, {
                     "type": "cluster_registration",
                     "cluster_type": "kubernetes",
                     "status": "registered",
@@ -299,8 +716,10 @@ class ClusterCoordinator:
                 success = await self.register_to_slurm(node_id)
                 if success:
                     node.slurm_registered = True
+                    self.invalidate_node(node_id)
+                    self.slurm_registered_count += 1
                     logger.info(f"✅ Node {node_id} registered to SLURM cluster with MUNGE authentication")
-                    await self.send_to_node(node_id, {
+                    self.send_to_node(node_id, {
                         "type": "cluster_registration",
                         "cluster_type": "slurm",
                         "status": "registered",
@@ -308,7 +727,7 @@ class ClusterCoordinator:
                     })
             else:
                 logger.warning(f"⚠️ Cannot register {node_id} to SLURM - MUNGE authentication not available")
-                await self.send_to_node(node_id, {
+                self.send_to_node(node_id, {
                     "type": "cluster_registration",
                     "cluster_type": "slurm",
                     "status": "failed",
@@ -320,53 +739,15 @@ class ClusterCoordinator:
         try:
             node = self.nodes[node_id]
             
-            # Create a node manifest for the Android device
-            node_manifest = f"""
-apiVersion: v1
-kind: Node
-metadata:
-  name: {node_id}
-  labels:
-    node-type: android
-    cluster-role: compute
-    architecture: arm64
-spec:
-  taints:
-  - key: android-node
-    value: "true"
-    effect: NoSchedule
-status:
-  addresses:
-  - type: InternalIP
-    address: {node.ip_address}
-  - type: Hostname
-    address: {node_id}
-  nodeInfo:
-    architecture: arm64
-    operatingSystem: android
-  capacity:
-    cpu: "4"
-    memory: "4Gi"
-    pods: "10"
-  allocatable:
-    cpu: "3"
-    memory: "3Gi"
-    pods: "10"
-"""
-            
-            # Write manifest to temp file
-            manifest_path = f"/tmp/{node_id}-node.yaml"
-            with open(manifest_path, 'w') as f:
-                f.write(node_manifest)
-            
-            # Apply the manifest
-            result = subprocess.run(['kubectl', 'apply', '-f', manifest_path],
-                                  capture_output=True, text=True, timeout=10)
-            
-            # Clean up temp file
-            os.remove(manifest_path)
+            # Fill in the precomputed node manifest for the Android device
+            node_manifest = (NODE_MANIFEST_TEMPLATE
+                             .replace(b'{name}', node_id.encode())
+                             .replace(b'{ip}', node.ip_address.encode()))
             
-            return result.returncode == 0
+            # Apply the manifest straight from stdin
+            result = await self.run_command('kubectl', 'apply', '-f', '-',
+                                            input=node_manifest)
+            return result is not None
             
         except Exception as e:
             logger.error(f"Failed to register {node_id} to Kubernetes: {e}")
@@ -384,13 +765,11 @@ status:
             
             # Generate MUNGE key for the Android node if needed
             munge_key_path = f"/tmp/{node_id}-munge.key"
-            try:
-                # Copy the main MUNGE key for this node (in production, this should be done securely)
-                subprocess.run(['cp', '/etc/munge/munge.key', munge_key_path], 
-                             capture_output=True, timeout=5)
+            # Copy the main MUNGE key for this node (in production, this should be done securely)
+            if await self.run_command('cp', '/etc/munge/munge.key', munge_key_path, timeout=5) is not None:
                 logger.info(f"MUNGE key prepared for {node_id}")
-            except Exception as e:
-                logger.warning(f"Could not prepare MUNGE key for {node_id}: {e}")
+            else:
+                logger.warning(f"Could not prepare MUNGE key for {node_id}")
             
             # Add node to SLURM configuration with MUNGE authentication
             slurm_config = f"""
@@ -408,10 +787,7 @@ PartitionName=android Nodes={node_id} Default=NO MaxTime=INFINITE State=UP \
 # AuthInfo=/etc/munge/munge.key
 """
             
-            # Write to a temporary SLURM config file
             config_path = f"/tmp/{node_id}-slurm.conf"
-            with open(config_path, 'w') as f:
-                f.write(slurm_config)
             
             # Create MUNGE setup script for the Android node
             munge_setup_script = f"""
@@ -440,10 +816,12 @@ echo "Testing MUNGE authentication..."
 echo "test" | munge | unmunge && echo "MUNGE authentication working" || echo "MUNGE authentication failed"
 """
             
+            # Write the SLURM config and setup script off the event loop
             setup_script_path = f"/tmp/{node_id}-munge-setup.sh"
-            with open(setup_script_path, 'w') as f:
-                f.write(munge_setup_script)
-            os.chmod(setup_script_path, 0o755)
+            await asyncio.to_thread(write_node_files, {
+                config_path: (slurm_config, 0o644),
+                setup_script_path: (munge_setup_script, 0o755),
+            })
             
             logger.info(f"SLURM config with MUNGE authentication prepared for {node_id}")
             logger.info(f"MUNGE setup script created at {setup_script_path}")
@@ -460,106 +838,137 @@ echo "test" | munge | unmunge && echo "MUNGE authentication working" || echo "MU
             logger.error(f"Failed to register {node_id} to SLURM with MUNGE: {e}")
             return False
     
-    def get_kubernetes_nodes(self) -> List[Dict[str, Any]]:
-        """Get all Kubernetes nodes and their status"""
+    async def run_command(self, *argv: str, timeout: float = 10,
+                          input: Optional[bytes] = None) -> Optional[str]:
+        """Run a command without blocking the event loop; stdout, or None on failure"""
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *argv, stdin=asyncio.subprocess.PIPE if input is not None else None,
+                stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+        except FileNotFoundError:
+            return None
+        try:
+            stdout, _ = await asyncio.wait_for(proc.communicate(input), timeout)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            return None
+        return stdout.decode() if proc.returncode == 0 else None
+    
+    async def get_kubernetes_nodes(self) -> List[Dict[str, Any]]:
+        """Get all Kubernetes nodes and their status (cached for CLUSTER_NODES_TTL)"""
         if not self.kubernetes_available:
             return []
         
+        cached_at, nodes = self.k8s_nodes_cache
+        if time.monotonic() - cached_at < CLUSTER_NODES_TTL:
+            return nodes
+        
         try:
-            result = subprocess.run(['kubectl', 'get', 'nodes', '-o', 'json'], 
-                                  capture_output=True, text=True, timeout=10)
-            if result.returncode == 0:
-                import json as json_lib
-                data = json_lib.loads(result.stdout)
-                nodes = []
-                
-                for item in data.get('items', []):
-                    node_name = item['metadata']['name']
-                    status = 'Ready'
-                    for condition in item.get('status', {}).get('conditions', []):
-                        if condition['type'] == 'Ready':
-                            status = 'Ready' if condition['status'] == 'True' else 'NotReady'
-                    
-                    # Get pod count
-                    pod_result = subprocess.run(['kubectl', 'get', 'pods', '--all-namespaces', 
-                                               '--field-selector', f'spec.nodeName={node_name}', 
-                                               '--no-headers'], 
-                                             capture_output=True, text=True, timeout=5)
-                    pod_count = len(pod_result.stdout.strip().split('\n')) if pod_result.stdout.strip() else 0
-                    
-                    nodes.append({
-                        'name': node_name,
-                        'status': status,
-                        'type': 'kubernetes',
-                        'pods': pod_count,
-                        'capacity': item.get('status', {}).get('capacity', {}),
-                        'allocatable': item.get('status', {}).get('allocatable', {})
-                    })
+            # Pods are only counted, so ask for just their node names rather
+            # than parsing the full pod JSON
+            nodes_json, pod_nodes = await asyncio.gather(
+                self.run_command('kubectl', 'get', 'nodes', '-o', 'json'),
+                self.run_command('kubectl', 'get', 'pods', '--all-namespaces', '-o',
+                                 'jsonpath={range .items[*]}{.spec.nodeName}{"\\n"}{end}'))
+            if nodes_json is None:
+                return []
+            
+            # One pod listing for the whole cluster, counted per node
+            pod_counts = Counter((pod_nodes or '').split())
+            
+            nodes = []
+            for item in orjson.loads(nodes_json).get('items', []):
+                node_name = item['metadata']['name']
+                status = 'Ready'
+                for condition in item.get('status', {}).get('conditions', []):
+                    if condition['type'] == 'Ready':
+                        status = 'Ready' if condition['status'] == 'True' else 'NotReady'
                 
-                return nodes
+                nodes.append({
+                    'name': node_name,
+                    'status': status,
+                    'type': 'kubernetes',
+                    'pods': pod_counts[node_name],
+                    'capacity': item.get('status', {}).get('capacity', {}),
+                    'allocatable': item.get('status', {}).get('allocatable', {})
+                })
+            
+            self.k8s_nodes_cache = (time.monotonic(), nodes)
+            return nodes
         except Exception as e:
             logger.error(f"Failed to get Kubernetes nodes: {e}")
             return []
     
-    def get_slurm_nodes(self) -> List[Dict[str, Any]]:
-        """Get all SLURM nodes and their status"""
+    async def get_slurm_nodes(self) -> List[Dict[str, Any]]:
+        """Get all SLURM nodes and their status (cached for CLUSTER_NODES_TTL)"""
         if not self.slurm_available:
             return []
         
+        cached_at, nodes = self.slurm_nodes_cache
+        if time.monotonic() - cached_at < CLUSTER_NODES_TTL:
+            return nodes
+        
         try:
-            result = subprocess.run(['sinfo', '-N', '-h', '-o', '%N %T %C %m %f'], 
-                                  capture_output=True, text=True, timeout=10)
-            if result.returncode == 0:
-                nodes = []
-                for line in result.stdout.strip().split('\n'):
-                    if line.strip():
-                        parts = line.split()
-                        if len(parts) >= 4:
-                            # Get job count for this node
-                            job_result = subprocess.run(['squeue', '-h', '-w', parts[0]], 
-                                                       capture_output=True, text=True, timeout=5)
-                            job_count = len(job_result.stdout.strip().split('\n')) if job_result.stdout.strip() else 0
-                            
-                            nodes.append({
-                                'name': parts[0],
-                                'status': parts[1],
-                                'type': 'slurm',
-                                'cpus': parts[2] if len(parts) > 2 else 'N/A',
-                                'memory': parts[3] if len(parts) > 3 else 'N/A',
-                                'features': parts[4] if len(parts) > 4 else '',
-                                'jobs': job_count
-                            })
-                
-                return nodes
+            sinfo_out, squeue_out = await asyncio.gather(
+                self.run_command('sinfo', '-N', '-h', '-o', '%N %T %C %m %f'),
+                self.run_command('squeue', '-h', '-o', '%N'))
+            if sinfo_out is None:
+                return []
+            
+            # One job listing for the whole cluster, counted per node
+            job_counts = Counter()
+            for line in (squeue_out or '').split():
+                job_counts.update(set(expand_hostlist(line)))
+            
+            nodes = []
+            for line in sinfo_out.strip().split('\n'):
+                if line.strip():
+                    parts = line.split()
+                    if len(parts) >= 4:
+                        nodes.append({
+                            'name': parts[0],
+                            'status': parts[1],
+                            'type': 'slurm',
+                            'cpus': parts[2] if len(parts) > 2 else 'N/A',
+                            'memory': parts[3] if len(parts) > 3 else 'N/A',
+                            'features': parts[4] if len(parts) > 4 else '',
+                            'jobs': job_counts[parts[0]]
+                        })
+            
+            self.slurm_nodes_cache = (time.monotonic(), nodes)
+            return nodes
         except Exception as e:
             logger.error(f"Failed to get SLURM nodes: {e}")
             return []
     
-    def get_cluster_status(self) -> Dict[str, Any]:
+    async def get_cluster_status(self) -> Dict[str, Any]:
         """Get current cluster status including all nodes"""
         # Get all cluster nodes
-        k8s_nodes = self.get_kubernetes_nodes()
-        slurm_nodes = self.get_slurm_nodes()
+        k8s_nodes, slurm_nodes = await asyncio.gather(
+            self.get_kubernetes_nodes(), self.get_slurm_nodes())
         
         return {
-            "android_nodes": {nid: asdict(node) for nid, node in self.nodes.items()},
+            "android_nodes": self.get_node_snapshots(),
             "kubernetes_nodes": k8s_nodes,
             "slurm_nodes": slurm_nodes,
             "tasks": {
-                "total": len(self.tasks),
-                "pending": len(self.task_queue),
-                "completed": len([t for t in self.tasks.values() if t.status == "completed"])
+                "total": len(self.tasks) + self.completed_count + self.failed_count,
+                # The queue can hold stale entries for finished tasks
+                "pending": sum(1 for task in self.tasks.values() if task.status == "pending"),
+                "completed": self.completed_count,
+                "failed": self.failed_count
             },
             "clusters": {
                 "kubernetes": {
                     "available": self.kubernetes_available,
-                    "registered_nodes": len([n for n in self.nodes.values() if n.kubernetes_registered]),
+                    "registered_nodes": self.k8s_registered_count,
                     "total_nodes": len(k8s_nodes)
                 },
                 "slurm": {
                     "available": self.slurm_available,
                     "munge_available": self.munge_available,
-                    "registered_nodes": len([n for n in self.nodes.values() if n.slurm_registered]),
+                    "registered_nodes": self.slurm_registered_count,
                     "total_nodes": len(slurm_nodes)
                 }
             },
@@ -569,64 +978,102 @@ echo "test" | munge | unmunge && echo "MUNGE authentication working" || echo "MU
 # Global coordinator instance
 coordinator = ClusterCoordinator()
 
+PRIME_CHUNK_SIZE = 1000
+
+def sample_tasks(prime_limit: int = 10000):
+    """Yield (task_type, data, priority) specs for the testing seed tasks.
+    
+    The prime range is split into chunks so it spreads across all
+    connected nodes instead of running serially on one device.
+    """
+    for start in range(1, prime_limit + 1, PRIME_CHUNK_SIZE):
+        end = min(start + PRIME_CHUNK_SIZE - 1, prime_limit)
+        yield ("prime_calculation", {"start": start, "end": end}, TaskPriority.HIGH)
+    yield ("matrix_multiplication", {"size": 100}, TaskPriority.NORMAL)
+    yield ("hash_computation", {"iterations": 1000}, TaskPriority.NORMAL)
+
+def json_response(data: Any, status: int = 200) -> web.Response:
+    """JSON HTTP response serialized with orjson"""
+    return web_response.Response(body=orjson.dumps(data), status=status,
+                                 content_type='application/json')
+
+async def get_cluster_status_etag() -> Tuple[Dict[str, Any], str]:
+    """Cluster status plus a hash of everything in it except the timestamp"""
+    status = await coordinator.get_cluster_status()
+    timestamp = status.pop("timestamp")
+    etag = hashlib.sha1(orjson.dumps(status)).hexdigest()
+    status["timestamp"] = timestamp
+    return status, etag
+
+async def cluster_status_response(request) -> web.Response:
+    """Cluster status as JSON, or a bodiless 304 if it has not changed.
+    
+    The ETag ignores the timestamp, so pollers revalidating an unchanged
+    cluster skip the transfer and the client-side re-render.
+    """
+    status, etag = await get_cluster_status_etag()
+    
+    if any(match.value == etag for match in request.if_none_match or ()):
+        response = web_response.Response(status=304)
+    else:
+        response = json_response(status)
+    response.etag = etag
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
 async def status_handler(request):
     """HTTP endpoint for cluster status"""
-    status = coordinator.get_cluster_status()
-    return web_response.json_response(status)
+    return await cluster_status_response(request)
 
 async def submit_task_handler(request):
     """HTTP endpoint for custom task submission"""
     try:
-        data = await request.json()
+        data = orjson.loads(await request.read())
         task_type = data.get('task_type')
         task_data = data.get('data', {})
-        priority = data.get('priority', 1)
+        priority = int(data.get('priority', TaskPriority.NORMAL))
         
         if not task_type:
-            return web_response.json_response(
+            return json_response(
                 {'error': 'task_type is required'}, status=400)
         
         task_id = coordinator.add_task(task_type, task_data, priority)
         
-        # Try to assign immediately if nodes are available
-        connected_nodes = [nid for nid, node in coordinator.nodes.items() 
-                          if node.status == "connected"]
-        if connected_nodes:
-            await coordinator.assign_task(connected_nodes[0])
+        # Try to assign immediately if nodes are waiting for work
+        await coordinator.dispatch_to_idle_nodes()
         
-        return web_response.json_response({
+        return json_response({
             'task_id': task_id,
             'status': 'submitted',
             'message': f'Task {task_id} submitted successfully'
         })
     except Exception as e:
         logger.error(f"Error submitting task: {e}")
-        return web_response.json_response(
+        return json_response(
             {'error': str(e)}, status=500)
 
 async def get_task_status_handler(request):
     """HTTP endpoint to get task status"""
     task_id = request.match_info.get('task_id')
     
-    if task_id not in coordinator.tasks:
-        return web_response.json_response(
+    task = coordinator.get_task(task_id)
+    if task is None:
+        return json_response(
             {'error': 'Task not found'}, status=404)
     
-    task = coordinator.tasks[task_id]
-    return web_response.json_response(asdict(task))
+    return json_response(coordinator.get_task_snapshot(task))
 
 async def list_tasks_handler(request):
     """HTTP endpoint to list all tasks"""
-    tasks = {tid: asdict(task) for tid, task in coordinator.tasks.items()}
-    return web_response.json_response({
-        'tasks': tasks,
-        'queue': coordinator.task_queue
+    return json_response({
+        'tasks': coordinator.get_task_snapshots(),
+        'queue': [task_id for _, _, task_id in sorted(coordinator.task_queue)]
     })
 
 async def deploy_apk_handler(request):
     """HTTP endpoint to deploy APK to Android devices via Kubernetes job"""
     try:
-        data = await request.json()
+        data = orjson.loads(await request.read())
         target_node = data.get('target_node', 'any')
         apk_url = data.get('apk_url', '')
         
@@ -669,49 +1116,67 @@ async def deploy_apk_handler(request):
             }
         }
         
-        # Apply the job to Kubernetes
-        import tempfile
-        import yaml
-        
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-            yaml.dump(job_manifest, f)
-            job_file = f.name
+        # Apply the job to Kubernetes. kubectl reads JSON manifests as well as
+        # YAML, so pipe the orjson encoding straight to its stdin.
+        proc = await asyncio.create_subprocess_exec(
+            'kubectl', 'apply', '-f', '-', stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+        stdout, stderr = await proc.communicate(orjson.dumps(job_manifest))
         
-        try:
-            result = subprocess.run(
-                ['kubectl', 'apply', '-f', job_file],
-                capture_output=True, text=True, check=True
-            )
-            
-            os.unlink(job_file)
-            
-            return web_response.json_response({
-                'job_name': job_name,
-                'status': 'deployed',
-                'message': f'APK deployment job {job_name} started successfully',
-                'kubectl_output': result.stdout
-            })
-            
-        except subprocess.CalledProcessError as e:
-            os.unlink(job_file)
-            return web_response.json_response({
-                'error': f'Failed to deploy job: {e.stderr}'
+        if proc.returncode != 0:
+            return json_response({
+                'error': f'Failed to deploy job: {stderr.decode()}'
             }, status=500)
+        
+        return json_response({
+            'job_name': job_name,
+            'status': 'deployed',
+            'message': f'APK deployment job {job_name} started successfully',
+            'kubectl_output': stdout.decode()
+        })
             
     except Exception as e:
         logger.error(f"Error deploying APK: {e}")
-        return web_response.json_response(
+        return json_response(
             {'error': str(e)}, status=500)
 
-async def dashboard_handler(request):
-    """Serve the dashboard HTML"""
+def load_dashboard() -> Tuple[Optional[bytes], Optional[str]]:
+    """Read dashboard.html once; returns (body, etag), or (None, None) if missing"""
     dashboard_path = os.path.join(os.path.dirname(__file__), 'dashboard.html')
     try:
-        with open(dashboard_path, 'r') as f:
-            content = f.read()
-        return web_response.Response(text=content, content_type='text/html')
+        with open(dashboard_path, 'rb') as f:
+            body = f.read()
     except FileNotFoundError:
+        return None, None
+    return body, hashlib.sha1(body).hexdigest()
+
+DASHBOARD_HTML, DASHBOARD_ETAG = load_dashboard()
+# Compressed once here instead of per response
+DASHBOARD_HTML_GZIP = gzip.compress(DASHBOARD_HTML, 9, mtime=0) if DASHBOARD_HTML else None
+
+def accepts_gzip(request) -> bool:
+    """Whether the client accepts a gzip-encoded body"""
+    return 'gzip' in request.headers.get('Accept-Encoding', '')
+
+async def dashboard_handler(request):
+    """Serve the dashboard HTML from memory, answering revalidations with 304"""
+    if DASHBOARD_HTML is None:
         return web_response.Response(text='Dashboard not found', status=404)
+    
+    # Each encoding is a separate representation with its own ETag
+    gzipped = accepts_gzip(request)
+    etag = f"{DASHBOARD_ETAG}-gzip" if gzipped else DASHBOARD_ETAG
+    headers = {'Cache-Control': 'no-cache', 'Vary': 'Accept-Encoding'}
+    if any(match.value == etag for match in request.if_none_match or ()):
+        response = web_response.Response(status=304, headers=headers)
+    else:
+        if gzipped:
+            headers['Content-Encoding'] = 'gzip'
+        response = web_response.Response(body=DASHBOARD_HTML_GZIP if gzipped else DASHBOARD_HTML,
+                                         content_type='text/html', charset='utf-8',
+                                         headers=headers)
+    response.etag = etag
+    return response
 
 async def main():
     """Start the cluster coordinator server"""
@@ -738,10 +1203,6 @@ async def main():
     cors.add(app.router.add_get('/tasks', list_tasks_handler))
     cors.add(app.router.add_post('/deploy_apk', deploy_apk_handler))
     
-    # Add CORS to all routes
-    for route in list(app.router.routes()):
-        cors.add(route)
-    
     # Start HTTP server
     runner = web.AppRunner(app)
     await runner.setup()
@@ -752,13 +1213,12 @@ async def main():
     ws_server = await websockets.serve(
         coordinator.register_handler,
         "0.0.0.0",
-        8765
+        8765,
+        **WS_SERVER_OPTIONS
     )
     
     # Add some sample tasks for testing
-    coordinator.add_task("prime_calculation", {"start": 1, "end": 10000}, priority=2)
-    coordinator.add_task("matrix_multiplication", {"size": 100}, priority=1)
-    coordinator.add_task("hash_computation", {"iterations": 1000}, priority=1)
+    coordinator.add_tasks(sample_tasks())
     
     logger.info("✅ WebSocket server running on ws://0.0.0.0:8765")
     logger.info("✅ HTTP dashboard available at http://0.0.0.0:8766")
@@ -772,6 +1232,8 @@ async def main():
         await runner.cleanup()
 
 if __name__ == "__main__":
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
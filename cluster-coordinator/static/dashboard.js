@@ -0,0 +1,113 @@
+function log(message) {
+    const logDiv = document.getElementById('log');
+    const time = new Date().toLocaleTimeString();
+    logDiv.innerHTML += `[${time}] ${message}<br>`;
+    logDiv.scrollTop = logDiv.scrollHeight;
+}
+
+async function refreshStatus() {
+    try {
+        const response = await fetch('/api/status');
+        const status = await response.json();
+        updateDashboard(status);
+        log('Status refreshed');
+    } catch (error) {
+        log(`Error: ${error.message}`);
+    }
+}
+
+// Node cards are built once per node and then only have their
+// text updated, so a status update never re-parses the node list
+const nodeCards = new Map();
+
+function createNodeCard(nodeId) {
+    const card = document.createElement('div');
+    card.innerHTML = `
+        <h3></h3>
+        <p><strong>IP:</strong> <span data-field="ip"></span></p>
+        <p><strong>Status:</strong> <span data-field="status"></span></p>
+        <p><strong>Tasks Completed:</strong> <span data-field="tasks"></span></p>
+        <p><strong>Performance:</strong> <span data-field="performance"></span></p>
+        <p><strong>Capabilities:</strong> <span data-field="capabilities"></span></p>
+    `;
+    card.querySelector('h3').textContent = nodeId;
+    card.fields = {};
+    for (const field of card.querySelectorAll('[data-field]')) {
+        card.fields[field.dataset.field] = field;
+    }
+    return card;
+}
+
+function updateDashboard(status) {
+    // Update stats
+    document.getElementById('node-count').textContent = Object.keys(status.android_nodes).length;
+    document.getElementById('task-count').textContent = status.tasks.total;
+    document.getElementById('completed-count').textContent = status.tasks.completed;
+    
+    // Update nodes, appending new cards in one batch
+    const newCards = document.createDocumentFragment();
+    for (const [nodeId, node] of Object.entries(status.android_nodes)) {
+        let card = nodeCards.get(nodeId);
+        if (!card) {
+            card = createNodeCard(nodeId);
+            nodeCards.set(nodeId, card);
+            newCards.appendChild(card);
+        }
+        card.className = `node ${node.status}`;
+        card.fields.ip.textContent = node.ip_address;
+        card.fields.status.textContent = node.status;
+        card.fields.status.className = `status ${node.status}`;
+        card.fields.tasks.textContent = node.tasks_completed;
+        card.fields.performance.textContent = node.performance_score.toFixed(2);
+        card.fields.capabilities.textContent = node.capabilities.join(', ');
+    }
+    for (const [nodeId, card] of nodeCards) {
+        if (!(nodeId in status.android_nodes)) {
+            card.remove();
+            nodeCards.delete(nodeId);
+        }
+    }
+    document.getElementById('nodes-container').appendChild(newCards);
+}
+
+async function addTask(taskType, data) {
+    try {
+        const response = await fetch('/api/add_task', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ task_type: taskType, data: data })
+        });
+        const result = await response.json();
+        log(`Added task: ${result.task_id} (${taskType})`);
+    } catch (error) {
+        log(`Error adding task: ${error.message}`);
+    }
+}
+
+function addPrimeTask() {
+    addTask('prime_calculation', { start: 1, end: 50000 });
+}
+
+function addMatrixTask() {
+    addTask('matrix_multiplication', { size: 150 });
+}
+
+function addHashTask() {
+    addTask('hash_computation', { iterations: 5000 });
+}
+
+// The server pushes status over a WebSocket whenever it changes;
+// reconnect after a pause if the connection drops
+function connectStatusSocket() {
+    const scheme = location.protocol === 'https:' ? 'wss' : 'ws';
+    const socket = new WebSocket(`${scheme}://${location.host}/ws/dashboard`);
+    socket.onmessage = (event) => updateDashboard(JSON.parse(event.data));
+    socket.onclose = () => {
+        log('Status connection lost, reconnecting...');
+        setTimeout(connectStatusSocket, 5000);
+    };
+}
+
+// Initial load
+connectStatusSocket();
+log('Dashboard initialized');
@@ -3,35 +3,43 @@
 Web Dashboard for Android Cluster Management
 """
 
-from aiohttp import web, web_ws
+from aiohttp import web, WSCloseCode
 import aiohttp_cors
-import json
+import orjson
 import asyncio
-from server import coordinator
+import gzip
+from pathlib import Path
+from server import (coordinator, TaskPriority, json_response, cluster_status_response,
+                    get_cluster_status_etag, accepts_gzip, WIRE_CODECS, WIRE_SUBPROTOCOLS)
 
-async def dashboard_handler(request):
-    """Serve the web dashboard"""
-    return web.Response(text="""
+try:
+    import uvloop
+except ImportError:  # uvloop is not available on Windows
+    uvloop = None
+
+# Longest wait between dashboard status checks, and the pause that lets a
+# burst of changes coalesce into a single push (seconds)
+DASHBOARD_PUSH_INTERVAL = 5
+DASHBOARD_PUSH_DEBOUNCE = 0.25
+
+DASHBOARD_SOCKETS = web.AppKey('dashboard_sockets', set)
+STATUS_PUSHER = web.AppKey('status_pusher', asyncio.Task)
+DASHBOARD_PAGE = web.AppKey('dashboard_page', tuple)
+
+# Stylesheet and script live in static/ and are served with a content hash in
+# the URL, so browsers can cache them for good and only the small page is
+# re-fetched
+STATIC_DIR = Path(__file__).parent / 'static'
+STATIC_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+# The dashboard page is static; it is rendered and encoded once per app
+# rather than on every GET
+DASHBOARD_HTML = """
 <!DOCTYPE html>
 <html>
 <head>
     <title>Android Cluster Dashboard</title>
-    <style>
-        body { font-family: Arial, sans-serif; margin: 20px; background: #f5f5f5; }
-        .container { max-width: 1200px; margin: 0 auto; }
-        .card { background: white; padding: 20px; margin: 10px 0; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
-        .node { display: inline-block; margin: 10px; padding: 15px; border: 1px solid #ddd; border-radius: 5px; min-width: 200px; }
-        .node.connected { border-color: #4CAF50; background: #f8fff8; }
-        .node.disconnected { border-color: #f44336; background: #fff8f8; }
-        .status { font-weight: bold; }
-        .connected { color: #4CAF50; }
-        .disconnected { color: #f44336; }
-        button { padding: 10px 20px; margin: 5px; border: none; border-radius: 4px; cursor: pointer; }
-        .btn-primary { background: #2196F3; color: white; }
-        .btn-success { background: #4CAF50; color: white; }
-        .btn-warning { background: #FF9800; color: white; }
-        #log { height: 200px; overflow-y: scroll; border: 1px solid #ddd; padding: 10px; background: #f9f9f9; font-family: monospace; }
-    </style>
+    <link rel="stylesheet" href="{css_url}">
 </head>
 <body>
     <div class="container">
@@ -63,102 +71,142 @@ async def dashboard_handler(request):
         </div>
     </div>
 
-    <script>
-        function log(message) {
-            const logDiv = document.getElementById('log');
-            const time = new Date().toLocaleTimeString();
-            logDiv.innerHTML += `[${time}] ${message}<br>`;
-            logDiv.scrollTop = logDiv.scrollHeight;
-        }
-        
-        async function refreshStatus() {
-            try {
-                const response = await fetch('/api/status');
-                const status = await response.json();
-                updateDashboard(status);
-                log('Status refreshed');
-            } catch (error) {
-                log(`Error: ${error.message}`);
-            }
-        }
-        
-        function updateDashboard(status) {
-            // Update stats
-            document.getElementById('node-count').textContent = Object.keys(status.nodes).length;
-            document.getElementById('task-count').textContent = status.tasks.total;
-            document.getElementById('completed-count').textContent = status.tasks.completed;
-            
-            // Update nodes
-            const nodesContainer = document.getElementById('nodes-container');
-            nodesContainer.innerHTML = '';
-            
-            for (const [nodeId, node] of Object.entries(status.nodes)) {
-                const nodeDiv = document.createElement('div');
-                nodeDiv.className = `node ${node.status}`;
-                nodeDiv.innerHTML = `
-                    <h3>${nodeId}</h3>
-                    <p><strong>IP:</strong> ${node.ip_address}</p>
-                    <p><strong>Status:</strong> <span class="status ${node.status}">${node.status}</span></p>
-                    <p><strong>Tasks Completed:</strong> ${node.tasks_completed}</p>
-                    <p><strong>Performance:</strong> ${node.performance_score.toFixed(2)}</p>
-                    <p><strong>Capabilities:</strong> ${node.capabilities.join(', ')}</p>
-                `;
-                nodesContainer.appendChild(nodeDiv);
-            }
-        }
-        
-        async function addTask(taskType, data) {
-            try {
-                const response = await fetch('/api/add_task', {
-                    method: 'POST',
-                    headers: { 'Content-Type': 'application/json' },
-                    body: JSON.stringify({ task_type: taskType, data: data })
-                });
-                const result = await response.json();
-                log(`Added task: ${result.task_id} (${taskType})`);
-                refreshStatus();
-            } catch (error) {
-                log(`Error adding task: ${error.message}`);
-            }
-        }
-        
-        function addPrimeTask() {
-            addTask('prime_calculation', { start: 1, end: 50000 });
-        }
-        
-        function addMatrixTask() {
-            addTask('matrix_multiplication', { size: 150 });
-        }
-        
-        function addHashTask() {
-            addTask('hash_computation', { iterations: 5000 });
-        }
-        
-        // Auto-refresh every 5 seconds
-        setInterval(refreshStatus, 5000);
-        
-        // Initial load
-        refreshStatus();
-        log('Dashboard initialized');
-    </script>
+    <script src="{js_url}"></script>
 </body>
 </html>
-    """, content_type='text/html')
+    """
+
+def render_dashboard(app):
+    """Render the dashboard page with versioned asset URLs, plain and gzipped"""
+    static = app.router['static']
+    html = DASHBOARD_HTML.format(
+        css_url=static.url_for(filename='dashboard.css'),
+        js_url=static.url_for(filename='dashboard.js')).encode('utf-8')
+    return html, gzip.compress(html, 9, mtime=0)
+
+async def dashboard_handler(request):
+    """Serve the web dashboard"""
+    headers = {'Cache-Control': 'public, max-age=300', 'Vary': 'Accept-Encoding'}
+    html, html_gzip = request.app[DASHBOARD_PAGE]
+    body = html
+    if accepts_gzip(request):
+        headers['Content-Encoding'] = 'gzip'
+        body = html_gzip
+    return web.Response(body=body, content_type='text/html', charset='utf-8', headers=headers)
 
 async def api_status(request):
     """API endpoint for cluster status"""
-    status = coordinator.get_cluster_status()
-    return web.json_response(status)
+    return await cluster_status_response(request)
+
+def socket_codec(ws: web.WebSocketResponse) -> str:
+    """Wire codec negotiated by a dashboard socket (browsers get JSON)"""
+    return ws.ws_protocol if ws.ws_protocol in WIRE_CODECS else "json"
+
+async def send_frame(ws: web.WebSocketResponse, frame):
+    """Send an encoded frame as text (JSON) or binary (msgpack)"""
+    if isinstance(frame, bytes):
+        await ws.send_bytes(frame)
+    else:
+        await ws.send_str(frame)
+
+async def ws_dashboard(request):
+    """WebSocket channel pushing cluster status to dashboard tabs"""
+    ws = web.WebSocketResponse(heartbeat=30, protocols=WIRE_SUBPROTOCOLS)
+    await ws.prepare(request)
+    
+    status, _ = await get_cluster_status_etag()
+    await send_frame(ws, WIRE_CODECS[socket_codec(ws)][0](status))
+    
+    sockets = request.app[DASHBOARD_SOCKETS]
+    sockets.add(ws)
+    try:
+        async for _ in ws:
+            pass  # Push only; nothing is expected from the browser
+    finally:
+        sockets.discard(ws)
+    return ws
+
+async def push_status(app):
+    """Send status to connected dashboards whenever the cluster changes"""
+    changed = asyncio.Event()
+    coordinator.status_listeners.append(changed.set)
+    last_etag = None
+    try:
+        while True:
+            # Kubernetes/SLURM listings change without coordinator events, so
+            # also check periodically
+            try:
+                await asyncio.wait_for(changed.wait(), DASHBOARD_PUSH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            # Let a burst of assignments/results settle into one push
+            await asyncio.sleep(DASHBOARD_PUSH_DEBOUNCE)
+            changed.clear()
+            
+            sockets = app[DASHBOARD_SOCKETS]
+            if not sockets:
+                continue
+            status, etag = await get_cluster_status_etag()
+            if etag == last_etag:
+                continue
+            last_etag = etag
+            # Encode once per wire format in use
+            frames = {}
+            for ws in sockets:
+                codec = socket_codec(ws)
+                if codec not in frames:
+                    frames[codec] = WIRE_CODECS[codec][0](status)
+            await asyncio.gather(*(send_frame(ws, frames[socket_codec(ws)]) for ws in list(sockets)),
+                                 return_exceptions=True)
+    finally:
+        coordinator.status_listeners.remove(changed.set)
+
+async def set_static_cache_headers(request, response):
+    """Mark hash-versioned static assets as cacheable forever"""
+    if request.path.startswith('/static/') and 'v' in request.query:
+        response.headers['Cache-Control'] = STATIC_CACHE_CONTROL
+
+async def start_status_push(app):
+    app[STATUS_PUSHER] = asyncio.create_task(push_status(app))
+
+async def stop_status_push(app):
+    app[STATUS_PUSHER].cancel()
+    for ws in list(app[DASHBOARD_SOCKETS]):
+        await ws.close(code=WSCloseCode.GOING_AWAY, message=b'Server shutdown')
 
 async def api_add_task(request):
     """API endpoint to add tasks"""
-    data = await request.json()
+    data = orjson.loads(await request.read())
     task_type = data.get('task_type')
     task_data = data.get('data', {})
-    priority = data.get('priority', 1)
+    priority = int(data.get('priority', TaskPriority.NORMAL))
     
     task_id = coordinator.add_task(task_type, task_data, priority)
-    return web.json_response({'task_id': task_id, 'status': 'added'})
+    await coordinator.dispatch_to_idle_nodes()
+    return json_response({'task_id': task_id, 'status': 'added'})
+
+async def api_add_tasks(request):
+    """API endpoint to add a list of tasks in one request"""
+    items = orjson.loads(await request.read())
+    if not isinstance(items, list):
+        return json_response({'error': 'Expected a JSON list of tasks'}, status=400)
+    
+    # Validate every item before any task is created
+    specs = []
+    for item in items:
+        if not isinstance(item, dict):
+            return json_response({'error': 'Each task must be a JSON object'}, status=400)
+        task_type = item.get('task_type')
+        priority = item.get('priority', TaskPriority.NORMAL)
+        if not isinstance(task_type, str) or not task_type:
+            return json_response({'error': 'task_type is required'}, status=400)
+        if not isinstance(priority, int) or isinstance(priority, bool):
+            return json_response({'error': 'priority must be an integer'}, status=400)
+        specs.append((task_type, item.get('data', {}), priority))
+    
+    task_ids = coordinator.add_tasks(specs)
+    await coordinator.dispatch_to_idle_nodes()
+    return json_response({'task_ids': task_ids, 'status': 'added'})
 
 async def create_web_app():
     """Create the web application"""
@@ -174,10 +222,19 @@ async def create_web_app():
         )
     })
     
+    app[DASHBOARD_SOCKETS] = set()
+    app.on_startup.append(start_status_push)
+    app.on_shutdown.append(stop_status_push)
+    app.on_response_prepare.append(set_static_cache_headers)
+    
     # Routes
     app.router.add_get('/', dashboard_handler)
     app.router.add_get('/api/status', api_status)
     app.router.add_post('/api/add_task', api_add_task)
+    app.router.add_post('/api/add_tasks', api_add_tasks)
+    app.router.add_get('/ws/dashboard', ws_dashboard)
+    app.router.add_static('/static', STATIC_DIR, name='static', append_version=True)
+    app[DASHBOARD_PAGE] = render_dashboard(app)
     
     # Add CORS to all routes
     for route in list(app.router.routes()):
@@ -197,4 +254,6 @@ async def start_web_server():
     print("Web dashboard available at http://localhost:8080")
 
 if __name__ == "__main__":
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     asyncio.run(start_web_server())
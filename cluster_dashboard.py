@@ -4,10 +4,17 @@ OddJobCluster Dashboard
 A simple web dashboard to monitor the SLURM and Kubernetes cluster
 """
 
-from flask import Flask, render_template_string, jsonify
+from flask import Flask, jsonify
 import subprocess
 import json
-import datetime
+import threading
+import time
+from datetime import datetime, timezone
+
+try:
+    from kubernetes import client as k8s_client, config as k8s_config
+except ImportError:  # fall back to shelling out to kubectl
+    k8s_client = None
 
 app = Flask(__name__)
 
@@ -84,40 +91,158 @@ HTML_TEMPLATE = """
 </html>
 """
 
-def run_command(cmd):
-    """Run a shell command and return output"""
+# render_template_string recompiles its source on every call; compile once
+DASHBOARD_TEMPLATE = app.jinja_env.from_string(HTML_TEMPLATE)
+
+# Status commands as argv lists, so no shell is spawned to parse them
+SLURM_COMMANDS = {
+    'sinfo': ['sinfo'],
+    'squeue': ['squeue'],
+}
+KUBECTL_COMMANDS = {
+    'k8s_nodes': ['kubectl', 'get', 'nodes'],
+    'k8s_pods': ['kubectl', 'get', 'pods', '--all-namespaces'],
+}
+
+def run_commands(commands, timeout=10):
+    """Run commands concurrently and return {name: output or error text}"""
+    procs = {}
+    outputs = {}
+    for name, argv in commands.items():
+        try:
+            procs[name] = subprocess.Popen(argv, stdout=subprocess.PIPE,
+                                           stderr=subprocess.PIPE, text=True)
+        except Exception as e:
+            outputs[name] = f"Error: {str(e)}"
+    
+    # All commands run at once; they share one deadline
+    deadline = time.monotonic() + timeout
+    for name, proc in procs.items():
+        try:
+            stdout, stderr = proc.communicate(timeout=max(0, deadline - time.monotonic()))
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.communicate()
+            outputs[name] = "Error: Command timed out"
+            continue
+        outputs[name] = stdout if proc.returncode == 0 else f"Error: {stderr}"
+    return outputs
+
+def load_kubernetes_api():
+    """CoreV1Api reusing one pooled HTTPS connection, or None to use kubectl"""
+    if k8s_client is None:
+        return None
+    try:
+        k8s_config.load_kube_config()
+    except Exception:
+        try:
+            k8s_config.load_incluster_config()
+        except Exception:
+            return None
+    return k8s_client.CoreV1Api()
+
+def format_age(created):
+    """Short kubectl-style age such as 45s, 12m, 3h or 20d"""
+    seconds = int((datetime.now(timezone.utc) - created).total_seconds())
+    for unit, size in (('d', 86400), ('h', 3600), ('m', 60)):
+        if seconds >= size:
+            return f"{seconds // size}{unit}"
+    return f"{seconds}s"
+
+def format_table(rows):
+    """Left-align rows into columns the way kubectl prints them"""
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    return ''.join('   '.join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip() + '\n'
+                   for row in rows)
+
+def kubernetes_status(api):
+    """Render nodes and pods as `kubectl get` tables via the API client"""
     try:
-        result = subprocess.run(cmd, shell=True, capture_output=True, text=True, timeout=10)
-        return result.stdout if result.returncode == 0 else f"Error: {result.stderr}"
-    except subprocess.TimeoutExpired:
-        return "Error: Command timed out"
+        nodes = api.list_node(_request_timeout=10).items
+        pods = api.list_pod_for_all_namespaces(_request_timeout=10).items
     except Exception as e:
-        return f"Error: {str(e)}"
+        error = f"Error: {str(e)}"
+        return error, error
+    
+    node_rows = [['NAME', 'STATUS', 'ROLES', 'AGE', 'VERSION']]
+    for node in nodes:
+        ready = next((c.status for c in node.status.conditions or [] if c.type == 'Ready'), None)
+        status = 'Ready' if ready == 'True' else 'NotReady'
+        if node.spec.unschedulable:
+            status += ',SchedulingDisabled'
+        roles = ','.join(sorted(label.split('/', 1)[1] for label in node.metadata.labels or {}
+                                if label.startswith('node-role.kubernetes.io/'))) or '<none>'
+        node_rows.append([node.metadata.name, status, roles,
+                          format_age(node.metadata.creation_timestamp),
+                          node.status.node_info.kubelet_version])
+    
+    pod_rows = [['NAMESPACE', 'NAME', 'READY', 'STATUS', 'RESTARTS', 'AGE']]
+    for pod in pods:
+        containers = pod.status.container_statuses or []
+        pod_rows.append([pod.metadata.namespace, pod.metadata.name,
+                         f"{sum(c.ready for c in containers)}/{len(pod.spec.containers)}",
+                         pod.status.reason or pod.status.phase,
+                         str(sum(c.restart_count for c in containers)),
+                         format_age(pod.metadata.creation_timestamp)])
+    
+    return format_table(node_rows), format_table(pod_rows)
+
+# Seconds between background refreshes of the cluster status snapshot
+REFRESH_INTERVAL = 5
+
+# Latest status snapshot; replaced wholesale so readers never need a lock
+status_snapshot = None
+_refresher_lock = threading.Lock()
+kubernetes_api = None
+
+def collect_status():
+    """Run the cluster commands once and return a status snapshot"""
+    if kubernetes_api is None:
+        outputs = run_commands({**SLURM_COMMANDS, **KUBECTL_COMMANDS})
+    else:
+        outputs = run_commands(SLURM_COMMANDS)
+        outputs['k8s_nodes'], outputs['k8s_pods'] = kubernetes_status(kubernetes_api)
+    return {
+        'slurm_info': f"{outputs['sinfo']}\n{outputs['squeue']}",
+        'k8s_nodes': outputs['k8s_nodes'],
+        'k8s_pods': outputs['k8s_pods'],
+        'timestamp': time.strftime('%Y-%m-%d %H:%M:%S')
+    }
+
+def refresh_status():
+    """Keep status_snapshot current; runs in a daemon thread"""
+    global status_snapshot
+    while True:
+        time.sleep(REFRESH_INTERVAL)
+        try:
+            status_snapshot = collect_status()
+        except Exception:
+            # Keep serving the last good snapshot (its timestamp shows how old
+            # it is) and try again next interval rather than let the thread die
+            app.logger.exception("Status refresh failed")
+
+def get_status():
+    """Return the latest snapshot, starting the refresher on first use"""
+    global status_snapshot, kubernetes_api
+    if status_snapshot is None:
+        with _refresher_lock:
+            if status_snapshot is None:
+                kubernetes_api = load_kubernetes_api()
+                status_snapshot = collect_status()
+                threading.Thread(target=refresh_status, daemon=True).start()
+    return status_snapshot
 
 @app.route('/')
 def dashboard():
-    slurm_info = run_command('sinfo && echo && squeue')
-    k8s_nodes = run_command('kubectl get nodes')
-    k8s_pods = run_command('kubectl get pods --all-namespaces')
-    timestamp = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    
-    return render_template_string(HTML_TEMPLATE, 
-                                slurm_info=slurm_info,
-                                k8s_nodes=k8s_nodes, 
-                                k8s_pods=k8s_pods,
-                                timestamp=timestamp)
+    return DASHBOARD_TEMPLATE.render(**get_status())
 
 @app.route('/api/status')
 def api_status():
     """API endpoint for AJAX updates"""
-    return jsonify({
-        'slurm_info': run_command('sinfo && echo && squeue'),
-        'k8s_nodes': run_command('kubectl get nodes'),
-        'k8s_pods': run_command('kubectl get pods --all-namespaces'),
-        'timestamp': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    })
+    return jsonify(get_status())
 
 if __name__ == '__main__':
     print("Starting OddJobCluster Dashboard...")
     print("Access the dashboard at: http://localhost:8080")
+    print("For production use: gunicorn -k gthread -w 1 --threads 8 -b 0.0.0.0:8080 wsgi:app")
     app.run(host='0.0.0.0', port=8080, debug=False)
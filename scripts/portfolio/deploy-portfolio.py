@@ -8,76 +8,165 @@ and manages portfolio web interface.
 import os
 import sys
 import json
+import base64
+import gzip
+import hashlib
 import yaml
 import subprocess
+import tempfile
 import argparse
 from pathlib import Path
 from typing import Dict, List, Optional
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from html import escape
+from string import Template
+
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader, SafeDumper
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Manifests deployed at once; stays below sshd's default MaxSessions (10) on
+# the shared SSH connection
+DEPLOY_WORKERS = 8
+
+# Kubernetes' default NodePort range
+NODE_PORT_MIN = 30000
+NODE_PORT_MAX = 32767
+
 class ClusterDeployer:
     def __init__(self, cluster_host: str, ssh_key_path: str):
         self.cluster_host = cluster_host
         self.ssh_key_path = ssh_key_path
         self.ssh_user = "ansible"
+        # All ssh calls share one authenticated connection through an
+        # OpenSSH ControlMaster, instead of a handshake per command
+        self.control_path = f'/tmp/ssh-portfolio-{os.getpid()}.sock'
+        self.ssh_options = [
+            '-i', self.ssh_key_path,
+            '-o', 'StrictHostKeyChecking=no',
+            '-o', f'ControlPath={self.control_path}'
+        ]
+        # Parsed `kubectl get services` output, dropped whenever we deploy
+        # (see invalidate_service_cache)
+        self._services = None
+        self._start_master()
+    
+    @property
+    def remote(self) -> str:
+        return f'{self.ssh_user}@{self.cluster_host}'
+    
+    def _start_master(self):
+        """Open the shared master connection (ssh falls back to direct connections if this fails)."""
+        master_cmd = [
+            'ssh', *self.ssh_options,
+            '-o', 'ControlMaster=yes',
+            '-o', 'ControlPersist=600',
+            '-M', '-N', '-f',
+            self.remote
+        ]
+        
+        result = subprocess.run(master_cmd, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                                stderr=subprocess.PIPE, text=True)
+        if result.returncode != 0:
+            logger.warning(f"Could not open shared SSH connection: {result.stderr.strip()}")
+    
+    def close(self):
+        """Shut down the shared master connection."""
+        subprocess.run(['ssh', '-o', f'ControlPath={self.control_path}', '-O', 'exit', self.remote],
+                       stdin=subprocess.DEVNULL, capture_output=True)
         
-    def execute_remote_command(self, command: str) -> tuple:
-        """Execute command on remote cluster."""
+    def execute_remote_command(self, command: str, input: Optional[str] = None) -> tuple:
+        """Execute command on remote cluster, optionally feeding it input on stdin."""
         ssh_cmd = [
-            'ssh', '-i', self.ssh_key_path, 
-            '-o', 'StrictHostKeyChecking=no',
-            f'{self.ssh_user}@{self.cluster_host}',
+            'ssh', *self.ssh_options,
+            self.remote,
             command
         ]
         
         try:
-            result = subprocess.run(ssh_cmd, capture_output=True, text=True, check=True)
+            result = subprocess.run(ssh_cmd, input=input, capture_output=True, text=True, check=True)
             return result.returncode, result.stdout, result.stderr
         except subprocess.CalledProcessError as e:
             return e.returncode, e.stdout, e.stderr
     
-    def copy_to_cluster(self, local_path: str, remote_path: str):
-        """Copy file to cluster."""
-        scp_cmd = [
-            'scp', '-i', self.ssh_key_path,
-            '-o', 'StrictHostKeyChecking=no',
-            local_path,
-            f'{self.ssh_user}@{self.cluster_host}:{remote_path}'
+    def execute_remote_json(self, command: str) -> tuple:
+        """Execute a command that prints JSON, parsing it straight off the SSH pipe."""
+        ssh_cmd = [
+            'ssh', *self.ssh_options,
+            self.remote,
+            command
         ]
         
-        subprocess.run(scp_cmd, check=True)
+        # stderr goes to a file so a chatty remote can't block the stdout pipe
+        with tempfile.TemporaryFile() as stderr_file:
+            with subprocess.Popen(ssh_cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                                  stderr=stderr_file) as proc:
+                try:
+                    data = json.load(proc.stdout)
+                except ValueError:
+                    data = None
+                returncode = proc.wait()
+            stderr_file.seek(0)
+            stderr = stderr_file.read().decode(errors='replace')
+        
+        return returncode, data, stderr
     
     def deploy_manifest(self, manifest_path: str) -> bool:
         """Deploy a Kubernetes manifest to the cluster."""
-        # Copy manifest to cluster
-        remote_path = f'/tmp/{Path(manifest_path).name}'
-        self.copy_to_cluster(manifest_path, remote_path)
-        
-        # Apply manifest
-        returncode, stdout, stderr = self.execute_remote_command(f'kubectl apply -f {remote_path}')
-        
+        return self.deploy_manifests_batch([manifest_path])
+    
+    def deploy_manifest_content(self, name: str, content: str) -> bool:
+        """Deploy a manifest held in memory; name is only used for logging."""
+        return self.apply_manifests({name: content})
+    
+    def deploy_manifests_batch(self, manifest_paths: List[str]) -> bool:
+        """Deploy several manifest files with one kubectl apply."""
+        return self.apply_manifests({path: Path(path).read_text() for path in manifest_paths})
+    
+    def apply_manifests(self, manifests: Dict[str, str]) -> bool:
+        """Apply manifests (name -> YAML) with one kubectl apply, streamed over SSH."""
+        # The leading separator keeps kubectl reading a YAML stream even when
+        # the first manifest is JSON
+        combined_yaml = '---\n' + '\n---\n'.join(manifests.values())
+        returncode, stdout, stderr = self.execute_remote_command('kubectl apply -f -', input=combined_yaml)
+        
+        self.invalidate_service_cache()
         if returncode == 0:
-            logger.info(f"Successfully deployed {manifest_path}")
+            logger.info(f"Successfully deployed {', '.join(manifests)}")
             return True
         else:
-            logger.error(f"Failed to deploy {manifest_path}: {stderr}")
+            logger.error(f"Failed to deploy {', '.join(manifests)}: {stderr}")
             return False
     
+    def invalidate_service_cache(self):
+        """Make the next get_services_json() call re-read services from the cluster."""
+        self._services = None
+    
+    def get_services_json(self) -> List[Dict]:
+        """Get all cluster services, fetched once and parsed locally."""
+        if self._services is None:
+            returncode, services, stderr = self.execute_remote_json('kubectl get services -o json')
+            if returncode != 0 or services is None:
+                logger.error(f"Failed to list services: {stderr}")
+                return []
+            self._services = services.get('items', [])
+        
+        return self._services
+    
     def get_service_urls(self) -> Dict[str, str]:
         """Get URLs for all portfolio services."""
-        returncode, stdout, stderr = self.execute_remote_command(
-            "kubectl get services -o json | jq -r '.items[] | select(.metadata.labels.project) | \"\\(.metadata.labels.project):\\(.spec.ports[0].nodePort)\"'"
-        )
-        
         service_urls = {}
-        if returncode == 0:
-            for line in stdout.strip().split('\n'):
-                if ':' in line:
-                    project, port = line.split(':', 1)
-                    service_urls[project] = f"http://{self.cluster_host}:{port}"
+        for service in self.get_services_json():
+            project = service.get('metadata', {}).get('labels', {}).get('project')
+            ports = service.get('spec', {}).get('ports') or [{}]
+            if project and ports[0].get('nodePort'):
+                service_urls[project] = f"http://{self.cluster_host}:{ports[0]['nodePort']}"
         
         return service_urls
 
@@ -85,36 +174,47 @@ class PortManager:
     def __init__(self, cluster_deployer: ClusterDeployer):
         self.deployer = cluster_deployer
         self.used_ports = set()
+        # Every NodePort in [NODE_PORT_MIN, _next_free) is known to be taken
+        self._next_free = NODE_PORT_MIN
         self._load_used_ports()
     
     def _load_used_ports(self):
         """Load currently used NodePorts from cluster."""
-        returncode, stdout, stderr = self.deployer.execute_remote_command(
-            "kubectl get services -o json | jq -r '.items[].spec.ports[]?.nodePort // empty'"
-        )
-        
-        if returncode == 0:
-            for line in stdout.strip().split('\n'):
-                if line.strip().isdigit():
-                    self.used_ports.add(int(line.strip()))
+        for service in self.deployer.get_services_json():
+            for port_spec in service.get('spec', {}).get('ports') or []:
+                if port_spec.get('nodePort'):
+                    self.used_ports.add(port_spec['nodePort'])
     
-    def get_available_port(self, start_port: int = 30000) -> int:
+    def get_available_port(self, start_port: int = NODE_PORT_MIN) -> int:
         """Get next available port starting from start_port."""
-        port = start_port
-        while port in self.used_ports or port > 32767:  # NodePort range limit
+        start_port = max(start_port, NODE_PORT_MIN)
+        # Skip the run of ports already handed out instead of rescanning it
+        port = max(start_port, self._next_free)
+        while port in self.used_ports:
             port += 1
+        if port > NODE_PORT_MAX:
+            raise RuntimeError(f"No free NodePort left in {NODE_PORT_MIN}-{NODE_PORT_MAX}")
         
         self.used_ports.add(port)
+        if start_port <= self._next_free:
+            self._next_free = port + 1
         return port
     
     def resolve_port_conflicts(self, manifest_content: str, project_name: str) -> str:
         """Resolve port conflicts in manifest by assigning new ports."""
-        manifest = yaml.safe_load(manifest_content)
+        # Only NodePort services need rewriting; pass everything else through
+        # without a YAML round-trip
+        if 'nodePort' not in manifest_content:
+            return manifest_content
         
-        if manifest.get('kind') == 'Service' and manifest.get('spec', {}).get('type') == 'NodePort':
-            ports = manifest['spec'].get('ports', [])
+        # A manifest file may hold several documents
+        manifests = list(yaml.load_all(manifest_content, Loader=SafeLoader))
+        
+        for manifest in manifests:
+            if not manifest or manifest.get('kind') != 'Service' or manifest.get('spec', {}).get('type') != 'NodePort':
+                continue
             
-            for port_spec in ports:
+            for port_spec in manifest['spec'].get('ports', []):
                 if 'nodePort' in port_spec:
                     old_port = port_spec['nodePort']
                     if old_port in self.used_ports:
@@ -122,12 +222,10 @@ class PortManager:
                         port_spec['nodePort'] = new_port
                         logger.info(f"Resolved port conflict for {project_name}: {old_port} -> {new_port}")
         
-        return yaml.dump(manifest)
+        return yaml.dump_all(manifests, Dumper=SafeDumper)
 
-def create_portfolio_web_interface(portfolio_data: Dict, service_urls: Dict[str, str]) -> str:
-    """Create HTML for portfolio web interface."""
-    
-    html_template = """
+# Page shell; $placeholders are filled by create_portfolio_web_interface
+PORTFOLIO_HTML_TEMPLATE = Template("""
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -308,19 +406,19 @@ def create_portfolio_web_interface(portfolio_data: Dict, service_urls: Dict[str,
             
             <div class="stats">
                 <div class="stat">
-                    <div class="stat-number">{{ total_projects }}</div>
+                    <div class="stat-number">$total_projects</div>
                     <div>Total Projects</div>
                 </div>
                 <div class="stat">
-                    <div class="stat-number">{{ projects_with_docker }}</div>
+                    <div class="stat-number">$projects_with_docker</div>
                     <div>Docker Projects</div>
                 </div>
                 <div class="stat">
-                    <div class="stat-number">{{ projects_with_web }}</div>
+                    <div class="stat-number">$projects_with_web</div>
                     <div>Web Apps</div>
                 </div>
                 <div class="stat">
-                    <div class="stat-number">{{ flagged_projects }}</div>
+                    <div class="stat-number">$flagged_projects</div>
                     <div>Need Attention</div>
                 </div>
             </div>
@@ -335,49 +433,7 @@ def create_portfolio_web_interface(portfolio_data: Dict, service_urls: Dict[str,
             </div>
             
             <div class="project-grid" id="projectGrid">
-                {% for project in projects %}
-                <div class="project-card {{ 'flagged' if project.validation_flags else '' }}" 
-                     data-tags="{{ 'web' if project.has_web_interface else '' }} {{ 'docker' if project.has_docker_compose else '' }} {{ 'flagged' if project.validation_flags else '' }}">
-                    
-                    <div class="project-title">{{ project.name }}</div>
-                    
-                    <div class="project-description">
-                        {{ project.description or 'No description available' }}
-                    </div>
-                    
-                    <div class="project-links">
-                        <a href="{{ project.repo_url }}" class="link-btn link-github" target="_blank">
-                            📁 Repository
-                        </a>
-                        
-                        {% if project.github_pages_url %}
-                        <a href="{{ project.github_pages_url }}" class="link-btn link-pages" target="_blank">
-                            📄 GitHub Pages
-                        </a>
-                        {% endif %}
-                        
-                        {% if project.name in service_urls %}
-                        <a href="{{ service_urls[project.name] }}" class="link-btn link-app" target="_blank">
-                            🌐 Live App
-                        </a>
-                        {% endif %}
-                    </div>
-                    
-                    {% if project.validation_flags %}
-                    <div class="flags">
-                        {% for flag in project.validation_flags %}
-                        <span class="flag">{{ flag.replace('_', ' ').title() }}</span>
-                        {% endfor %}
-                    </div>
-                    {% endif %}
-                    
-                    {% if project.docker_services %}
-                    <div class="services">
-                        <strong>Services:</strong> {{ ', '.join(project.docker_services) }}
-                    </div>
-                    {% endif %}
-                </div>
-                {% endfor %}
+$projects_html
             </div>
         </div>
     </div>
@@ -412,14 +468,72 @@ def create_portfolio_web_interface(portfolio_data: Dict, service_urls: Dict[str,
     </script>
 </body>
 </html>
-    """
+""")
+
+# data-tags values for a card, indexed by web << 2 | docker << 1 | flagged
+CARD_TAGS = ("", "flagged", "docker", "docker flagged",
+             "web", "web flagged", "web docker", "web docker flagged")
+
+@lru_cache(maxsize=None)
+def flag_label(flag: str) -> str:
+    """Escaped display label for a validation flag (the same few recur across projects)."""
+    return escape(flag.replace('_', ' ').title())
+
+def render_project_card(project: Dict, service_urls: Dict[str, str]) -> str:
+    """Render one project card of the portfolio page."""
+    flags = project.get('validation_flags') or []
+    flagged = 'flagged' if flags else ''
+    tags = CARD_TAGS[bool(project.get('has_web_interface')) << 2
+                     | bool(project.get('has_docker_compose')) << 1
+                     | bool(flags)]
+    
+    links = [f'''
+                        <a href="{escape(project.get('repo_url') or '')}" class="link-btn link-github" target="_blank">
+                            📁 Repository
+                        </a>''']
+    if project.get('github_pages_url'):
+        links.append(f'''
+                        <a href="{escape(project['github_pages_url'])}" class="link-btn link-pages" target="_blank">
+                            📄 GitHub Pages
+                        </a>''')
+    if project['name'] in service_urls:
+        links.append(f'''
+                        <a href="{escape(service_urls[project['name']])}" class="link-btn link-app" target="_blank">
+                            🌐 Live App
+                        </a>''')
     
-    from jinja2 import Template
-    template = Template(html_template)
+    extras = []
+    if flags:
+        flag_spans = ''.join(f'''
+                        <span class="flag">{flag_label(flag)}</span>''' for flag in flags)
+        extras.append(f'''
+                    <div class="flags">{flag_spans}
+                    </div>''')
+    if project.get('docker_services'):
+        extras.append(f'''
+                    <div class="services">
+                        <strong>Services:</strong> {escape(', '.join(project['docker_services']))}
+                    </div>''')
     
-    return template.render(
-        projects=portfolio_data['projects'],
-        service_urls=service_urls,
+    return f'''
+                <div class="project-card {flagged}" 
+                     data-tags="{tags}">
+                    
+                    <div class="project-title">{escape(project['name'])}</div>
+                    
+                    <div class="project-description">
+                        {escape(project.get('description') or 'No description available')}
+                    </div>
+                    
+                    <div class="project-links">{''.join(links)}
+                    </div>{''.join(extras)}
+                </div>'''
+
+def create_portfolio_web_interface(portfolio_data: Dict, service_urls: Dict[str, str]) -> str:
+    """Create HTML for portfolio web interface."""
+    return PORTFOLIO_HTML_TEMPLATE.substitute(
+        projects_html=''.join(render_project_card(project, service_urls)
+                              for project in portfolio_data['projects']),
         total_projects=portfolio_data['total_projects'],
         projects_with_docker=portfolio_data['projects_with_docker'],
         projects_with_web=portfolio_data['projects_with_web_interface'],
@@ -447,121 +561,150 @@ def main():
     
     # Initialize deployer and port manager
     deployer = ClusterDeployer(args.cluster_host, args.ssh_key)
-    port_manager = PortManager(deployer)
-    
-    # Deploy all project manifests
-    deployed_projects = []
-    
-    for project_dir in portfolio_dir.iterdir():
-        if not project_dir.is_dir() or project_dir.name == '__pycache__':
-            continue
-        
-        project_name = project_dir.name
-        logger.info(f"Deploying project: {project_name}")
-        
-        # Deploy all manifests in project directory
-        success = True
-        for manifest_file in project_dir.glob('*.yaml'):
-            # Read and resolve port conflicts
-            manifest_content = manifest_file.read_text()
-            resolved_content = port_manager.resolve_port_conflicts(manifest_content, project_name)
-            
-            # Write resolved manifest
-            resolved_file = project_dir / f"resolved_{manifest_file.name}"
-            resolved_file.write_text(resolved_content)
+    try:
+        port_manager = PortManager(deployer)
+        
+        # Resolve port conflicts for all project manifests (serially, since
+        # the port manager hands out ports from shared state)
+        manifests = []  # (project name, manifest name, resolved YAML)
+        project_names = []
+        
+        # scandir's entries know whether they are directories without a stat
+        with os.scandir(portfolio_dir) as entries:
+            project_dirs = [Path(entry.path) for entry in entries
+                            if entry.is_dir() and entry.name != '__pycache__']
+        
+        for project_dir in project_dirs:
+            project_name = project_dir.name
+            project_names.append(project_name)
+            logger.info(f"Resolving project: {project_name}")
             
-            # Deploy resolved manifest
-            if not deployer.deploy_manifest(str(resolved_file)):
-                success = False
-        
-        if success:
-            deployed_projects.append(project_name)
-    
-    # Get service URLs
-    service_urls = deployer.get_service_urls()
-    
-    # Create and deploy portfolio web interface
-    portfolio_html = create_portfolio_web_interface(portfolio_data, service_urls)
-    
-    # Save portfolio HTML
-    portfolio_html_file = portfolio_dir / 'portfolio.html'
-    portfolio_html_file.write_text(portfolio_html)
-    
-    # Deploy portfolio web interface as ConfigMap and Service
-    portfolio_configmap = {
-        'apiVersion': 'v1',
-        'kind': 'ConfigMap',
-        'metadata': {
-            'name': 'portfolio-html',
-            'labels': {'app': 'portfolio'}
-        },
-        'data': {
-            'index.html': portfolio_html
+            for manifest_file in sorted([*project_dir.glob('*.yaml'), *project_dir.glob('*.json')]):
+                # Skip resolved copies left behind by older versions of this script
+                if manifest_file.name.startswith('resolved_'):
+                    continue
+                
+                # Read and resolve port conflicts; the result is streamed
+                # straight to kubectl, never written back to disk
+                manifest_content = manifest_file.read_text()
+                resolved_content = port_manager.resolve_port_conflicts(manifest_content, project_name)
+                manifests.append((project_name, f"{project_name}/{manifest_file.name}", resolved_content))
+        
+        # Apply everything in one round-trip. If that fails, deploy manifests
+        # individually (concurrently) to find out which projects are broken.
+        failed_projects = set()
+        if manifests and not deployer.apply_manifests({name: content for _, name, content in manifests}):
+            with ThreadPoolExecutor(max_workers=DEPLOY_WORKERS) as executor:
+                futures = {executor.submit(deployer.deploy_manifest_content, name, content): project_name
+                           for project_name, name, content in manifests}
+                for future in as_completed(futures):
+                    if not future.result():
+                        failed_projects.add(futures[future])
+        
+        deployed_projects = [name for name in project_names if name not in failed_projects]
+        
+        # Get service URLs
+        service_urls = deployer.get_service_urls()
+        
+        # Create and deploy portfolio web interface
+        portfolio_html = create_portfolio_web_interface(portfolio_data, service_urls)
+        
+        # Save portfolio HTML
+        portfolio_html_file = portfolio_dir / 'portfolio.html'
+        portfolio_html_file.write_text(portfolio_html)
+        
+        # Deploy portfolio web interface as ConfigMap and Service
+        portfolio_html_gz = gzip.compress(portfolio_html.encode('utf-8'), 9, mtime=0)
+        portfolio_configmap = {
+            'apiVersion': 'v1',
+            'kind': 'ConfigMap',
+            'metadata': {
+                'name': 'portfolio-html',
+                'labels': {'app': 'portfolio'}
+            },
+            # Stored gzipped to keep the ConfigMap (and kubectl's
+            # last-applied annotation) well under the etcd size limits
+            'binaryData': {
+                'index.html.gz': base64.b64encode(portfolio_html_gz).decode('ascii')
+            }
         }
-    }
-    
-    portfolio_deployment = {
-        'apiVersion': 'apps/v1',
-        'kind': 'Deployment',
-        'metadata': {
-            'name': 'portfolio',
-            'labels': {'app': 'portfolio'}
-        },
-        'spec': {
-            'replicas': 1,
-            'selector': {'matchLabels': {'app': 'portfolio'}},
-            'template': {
-                'metadata': {'labels': {'app': 'portfolio'}},
-                'spec': {
-                    'containers': [{
-                        'name': 'nginx',
-                        'image': 'nginx:alpine',
-                        'ports': [{'containerPort': 80}],
-                        'volumeMounts': [{
-                            'name': 'html',
-                            'mountPath': '/usr/share/nginx/html'
-                        }]
-                    }],
-                    'volumes': [{
-                        'name': 'html',
-                        'configMap': {'name': 'portfolio-html'}
-                    }]
+        
+        portfolio_deployment = {
+            'apiVersion': 'apps/v1',
+            'kind': 'Deployment',
+            'metadata': {
+                'name': 'portfolio',
+                'labels': {'app': 'portfolio'}
+            },
+            'spec': {
+                'replicas': 1,
+                'selector': {'matchLabels': {'app': 'portfolio'}},
+                'template': {
+                    'metadata': {
+                        'labels': {'app': 'portfolio'},
+                        # The page is unpacked at pod start, so roll the pods
+                        # whenever it changes
+                        'annotations': {'portfolio/html-sha256': hashlib.sha256(portfolio_html_gz).hexdigest()}
+                    },
+                    'spec': {
+                        'initContainers': [{
+                            'name': 'unpack-html',
+                            # Same image as the web server (its busybox has gunzip),
+                            # so a rollout pulls nothing extra
+                            'image': 'nginx:alpine',
+                            'command': ['sh', '-c', 'gunzip -c /portfolio/index.html.gz > /html/index.html'],
+                            'volumeMounts': [
+                                {'name': 'portfolio-html', 'mountPath': '/portfolio'},
+                                {'name': 'html', 'mountPath': '/html'}
+                            ]
+                        }],
+                        'containers': [{
+                            'name': 'nginx',
+                            'image': 'nginx:alpine',
+                            'ports': [{'containerPort': 80}],
+                            'volumeMounts': [{
+                                'name': 'html',
+                                'mountPath': '/usr/share/nginx/html'
+                            }]
+                        }],
+                        'volumes': [
+                            {'name': 'portfolio-html', 'configMap': {'name': 'portfolio-html'}},
+                            {'name': 'html', 'emptyDir': {}}
+                        ]
+                    }
                 }
             }
         }
-    }
-    
-    portfolio_service = {
-        'apiVersion': 'v1',
-        'kind': 'Service',
-        'metadata': {
-            'name': 'portfolio-service',
-            'labels': {'app': 'portfolio'}
-        },
-        'spec': {
-            'type': 'NodePort',
-            'selector': {'app': 'portfolio'},
-            'ports': [{
-                'port': 80,
-                'targetPort': 80,
-                'nodePort': 30080
-            }]
+        
+        portfolio_service = {
+            'apiVersion': 'v1',
+            'kind': 'Service',
+            'metadata': {
+                'name': 'portfolio-service',
+                'labels': {'app': 'portfolio'}
+            },
+            'spec': {
+                'type': 'NodePort',
+                'selector': {'app': 'portfolio'},
+                'ports': [{
+                    'port': 80,
+                    'targetPort': 80,
+                    'nodePort': 30080
+                }]
+            }
         }
-    }
-    
-    # Deploy portfolio components
-    for manifest, name in [
-        (portfolio_configmap, 'configmap'),
-        (portfolio_deployment, 'deployment'), 
-        (portfolio_service, 'service')
-    ]:
-        manifest_file = portfolio_dir / f'portfolio-{name}.yaml'
-        manifest_file.write_text(yaml.dump(manifest))
+        
+        # Deploy portfolio components as one multi-document manifest
+        manifest_file = portfolio_dir / 'portfolio-all.yaml'
+        manifest_file.write_text(yaml.dump_all(
+            [portfolio_configmap, portfolio_deployment, portfolio_service], Dumper=SafeDumper))
         deployer.deploy_manifest(str(manifest_file))
-    
-    logger.info(f"Portfolio deployment complete!")
-    logger.info(f"Deployed {len(deployed_projects)} projects")
-    logger.info(f"Portfolio web interface: http://{args.cluster_host}:30080")
+        
+        logger.info(f"Portfolio deployment complete!")
+        logger.info(f"Deployed {len(deployed_projects)} projects")
+        logger.info(f"Portfolio web interface: http://{args.cluster_host}:30080")
+    finally:
+        deployer.close()
 
 if __name__ == '__main__':
     main()
@@ -8,19 +8,54 @@ and generates Kubernetes deployments for cluster portfolio hosting.
 import os
 import sys
 import json
+import orjson
 import yaml
-import requests
+import asyncio
+import aiohttp
+import shelve
+import time
 import argparse
 from pathlib import Path
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Any, Tuple
+from dataclasses import dataclass
 import re
 import logging
-from datetime import datetime
+from datetime import datetime, timezone
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+GITHUB_API = 'https://api.github.com'
+# Concurrent requests to the GitHub API
+GITHUB_CONCURRENCY = 20
+REPOS_PER_PAGE = 100
+# Rate limiting: how often to retry a throttled request, and how many
+# requests to leave unused before pausing until the limit resets
+GITHUB_MAX_RETRIES = 5
+RATE_LIMIT_RESERVE = 50
+LAST_PAGE_RE = re.compile(r'<[^>]*[?&]page=(\d+)[^>]*>;\s*rel="last"')
+# Host ports that suggest a service has a web interface
+WEB_PORTS = frozenset({80, 443, 3000, 8000, 8080, 5000, 4200, 4000, 8888})
+# Compose port mapping: "port", "host:container", optionally with "/protocol"
+PORT_MAPPING_RE = re.compile(r'^(?:(\d+):)?(\d+)(?:/\w+)?$')
+
+# Files looked up in every repository, by GraphQL alias
+REPO_FILES = {
+    'composeYml': 'docker-compose.yml',
+    'composeYaml': 'docker-compose.yaml',
+    'readme': 'README.md',
+    'readmeLower': 'readme.md',
+}
+REPO_FILES_FIELDS = ' '.join(
+    f'{alias}: object(expression: "HEAD:{path}") {{ ... on Blob {{ text }} }}' for alias, path in REPO_FILES.items())
+# Repositories whose files are fetched per GraphQL query
+GRAPHQL_BATCH_SIZE = 25
+
 @dataclass
 class ProjectInfo:
     name: str
@@ -41,90 +76,241 @@ class ProjectInfo:
             self.validation_flags = []
 
 class GitHubScanner:
-    def __init__(self, token: str, username: str = None):
+    def __init__(self, token: str, username: str = None, cache_path: Optional[str] = None):
         self.token = token
         self.username = username
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.cache_path = cache_path
+        # url -> (ETag, parsed body, Link header), kept across scans so
+        # unchanged resources come back as bodiless 304s
+        self.etag_cache = None
+        self.headers = {
             'Authorization': f'token {token}',
             'Accept': 'application/vnd.github.v3+json'
-        })
+        }
+        self.session: Optional[aiohttp.ClientSession] = None
+        # When rate limited, requests hold off until this time (epoch
+        # seconds); the lock makes them share a single pause
+        self.resume_at = 0.0
+        self.rate_limit_lock: Optional[asyncio.Lock] = None
+    
+    async def __aenter__(self):
+        # One pooled session for the whole scan; the connector limit bounds
+        # how many requests are in flight at once
+        self.session = aiohttp.ClientSession(
+            headers=self.headers,
+            connector=aiohttp.TCPConnector(limit=GITHUB_CONCURRENCY, limit_per_host=GITHUB_CONCURRENCY)
+        )
+        self.rate_limit_lock = asyncio.Lock()
+        if self.cache_path:
+            self.etag_cache = shelve.open(self.cache_path)
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.session.close()
+        if self.etag_cache is not None:
+            self.etag_cache.close()
+    
+    async def api_request(self, method: str, url: str, **kwargs) -> aiohttp.ClientResponse:
+        """Send a request to the GitHub API, waiting out rate limits instead of failing."""
+        for attempt in range(1, GITHUB_MAX_RETRIES + 1):
+            await self.wait_for_rate_limit()
+            response = await self.session.request(method, url, **kwargs)
+            delay = self.rate_limit_delay(response)
+            if delay is None:
+                break
+            if attempt == GITHUB_MAX_RETRIES:
+                # Out of retries: hand the error response back for raise_for_status
+                break
+            response.release()
+            self.pause_requests(delay)
         
-    def get_user_repos(self) -> List[Dict]:
+        # Close to the limit: hold off later requests until it resets rather
+        # than run into it; this response is returned to be read right away
+        remaining = response.headers.get('X-RateLimit-Remaining')
+        if remaining is not None and int(remaining) < RATE_LIMIT_RESERVE and response.status < 400:
+            self.pause_requests(self.rate_limit_reset_delay(response))
+        return response
+    
+    def pause_requests(self, delay: float):
+        """Hold off new requests for at least delay seconds."""
+        self.resume_at = max(self.resume_at, time.time() + delay)
+    
+    async def wait_for_rate_limit(self):
+        """Wait out any rate limit pause; concurrent callers share one sleep."""
+        if time.time() >= self.resume_at:
+            return
+        async with self.rate_limit_lock:
+            delay = self.resume_at - time.time()
+            if delay > 0:
+                logger.warning(f"GitHub rate limit reached, pausing requests for {delay:.0f}s")
+                await asyncio.sleep(delay)
+    
+    @staticmethod
+    def rate_limit_reset_delay(response: aiohttp.ClientResponse) -> float:
+        """Seconds until the rate limit window in the response headers resets."""
+        reset = response.headers.get('X-RateLimit-Reset')
+        return max(int(reset) - time.time(), 0) + 1 if reset else 60
+    
+    @staticmethod
+    def rate_limit_delay(response: aiohttp.ClientResponse) -> Optional[float]:
+        """Seconds to wait before retrying a rate-limited response, or None if it wasn't."""
+        if response.status not in (403, 429):
+            return None
+        retry_after = response.headers.get('Retry-After')
+        if retry_after:
+            return float(retry_after)
+        if response.status == 429 or response.headers.get('X-RateLimit-Remaining') == '0':
+            return GitHubScanner.rate_limit_reset_delay(response)
+        return None  # A plain 403 (e.g. no access) is not worth retrying
+    
+    async def get_json(self, url: str) -> Tuple[Any, Optional[str]]:
+        """GET a REST resource as (parsed body, Link header), or (None, None) if it doesn't exist."""
+        cached = self.etag_cache.get(url) if self.etag_cache is not None else None
+        headers = {'If-None-Match': cached[0]} if cached else {}
+        async with await self.api_request('GET', url, headers=headers) as response:
+            if response.status == 304 and cached:
+                return cached[1], cached[2]
+            if response.status == 404:
+                return None, None
+            
+            response.raise_for_status()
+            body = await response.json()
+            link = response.headers.get('Link')
+            etag = response.headers.get('ETag')
+        
+        if etag and self.etag_cache is not None:
+            self.etag_cache[url] = (etag, body, link)
+        return body, link
+        
+    async def get_repos_page(self, page: int) -> Tuple[List[Dict], Optional[int]]:
+        """Get one page of the authenticated user's repositories, and the last page number if known."""
+        url = f'{GITHUB_API}/user/repos?page={page}&per_page={REPOS_PER_PAGE}'
+        repos, link = await self.get_json(url)
+        last_page = LAST_PAGE_RE.search(link) if link else None
+        return repos or [], int(last_page.group(1)) if last_page else None
+    
+    async def get_user_repos(self) -> List[Dict]:
         """Get all repositories for the authenticated user."""
-        repos = []
-        page = 1
+        repos, last_page = await self.get_repos_page(1)
         
-        while True:
-            url = f'https://api.github.com/user/repos?page={page}&per_page=100'
-            response = self.session.get(url)
-            response.raise_for_status()
-            
-            page_repos = response.json()
-            if not page_repos:
-                break
-                
-            repos.extend(page_repos)
-            page += 1
+        if last_page:
+            # The first page says how many there are; fetch the rest at once
+            pages = await asyncio.gather(*(self.get_repos_page(page) for page in range(2, last_page + 1)))
+            for page_repos, _ in pages:
+                repos.extend(page_repos)
+        else:
+            # No pagination header: fall back to walking pages until one is empty
+            page = 1
+            page_repos = repos
+            while page_repos and len(page_repos) == REPOS_PER_PAGE:
+                page += 1
+                page_repos, _ = await self.get_repos_page(page)
+                repos.extend(page_repos)
             
         logger.info(f"Found {len(repos)} repositories")
         return repos
     
-    def get_file_content(self, repo_name: str, file_path: str) -> Optional[str]:
-        """Get content of a file from repository."""
-        url = f'https://api.github.com/repos/{repo_name}/contents/{file_path}'
-        response = self.session.get(url)
+    async def graphql_repos_metadata(self, repo_names: List[str]) -> List[Optional[Dict[str, Optional[str]]]]:
+        """Get the Docker Compose and README candidates of several repositories in one GraphQL query.
         
-        if response.status_code == 404:
-            return None
-            
-        response.raise_for_status()
-        content = response.json()
+        Repositories the query could not resolve come back as None.
+        """
+        # One aliased repository field per repo; JSON string literals are valid GraphQL strings
+        fields = []
+        for i, repo_name in enumerate(repo_names):
+            owner, name = repo_name.split('/', 1)
+            fields.append(f'repo{i}: repository(owner: {json.dumps(owner)}, name: {json.dumps(name)}) {{ {REPO_FILES_FIELDS} }}')
+        query = {'query': 'query { %s }' % ' '.join(fields)}
+        async with await self.api_request('POST', f'{GITHUB_API}/graphql', json=query) as response:
+            response.raise_for_status()
+            result = await response.json()
         
-        if content.get('encoding') == 'base64':
-            import base64
-            return base64.b64decode(content['content']).decode('utf-8')
+        errors = result.get('errors') or []
+        for error in errors:
+            path = '.'.join(str(part) for part in error.get('path') or [])
+            logger.error(f"GitHub GraphQL error{f' at {path}' if path else ''}: {error.get('message')}")
         
-        return content.get('content')
+        data = result.get('data')
+        if data is None:
+            raise RuntimeError(f"GitHub GraphQL query failed with {len(errors)} error(s)")
+        
+        files = []
+        for i in range(len(repo_names)):
+            repository = data.get(f'repo{i}')
+            if repository is None:
+                # Not resolved (see the errors above); don't mistake it for a
+                # repository without a Docker Compose file or README
+                files.append(None)
+                continue
+            # Missing files come back as null objects; binary blobs have null text
+            files.append({alias: (repository.get(alias) or {}).get('text') for alias in REPO_FILES})
+        return files
     
-    def check_github_pages(self, repo_name: str) -> Optional[str]:
+    async def check_github_pages(self, repo_name: str) -> Optional[str]:
         """Check if repository has GitHub Pages enabled."""
-        url = f'https://api.github.com/repos/{repo_name}/pages'
-        response = self.session.get(url)
-        
-        if response.status_code == 200:
-            pages_info = response.json()
-            return pages_info.get('html_url')
-        
-        return None
+        pages_info, _ = await self.get_json(f'{GITHUB_API}/repos/{repo_name}/pages')
+        return pages_info.get('html_url') if pages_info else None
     
     def analyze_readme(self, content: str) -> str:
         """Analyze README quality."""
         if not content:
             return "missing"
         
-        lines = content.split('\n')
-        non_empty_lines = [line.strip() for line in lines if line.strip()]
-        
-        # Basic quality checks
-        has_description = any(len(line) > 50 for line in non_empty_lines[:5])
-        has_installation = any('install' in line.lower() for line in non_empty_lines)
-        has_usage = any('usage' in line.lower() or 'example' in line.lower() for line in non_empty_lines)
-        has_sections = len([line for line in non_empty_lines if line.startswith('#')]) >= 3
+        # Basic quality checks, in a single pass over the lines
+        line_count = 0
+        section_count = 0
+        has_description = has_installation = has_usage = False
+        for line in content.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            
+            line_count += 1
+            if line_count <= 5 and len(line) > 50:
+                has_description = True
+            if line.startswith('#'):
+                section_count += 1
+            if not (has_installation and has_usage):
+                line_lower = line.lower()
+                has_installation = has_installation or 'install' in line_lower
+                has_usage = has_usage or 'usage' in line_lower or 'example' in line_lower
+        has_sections = section_count >= 3
         
-        if len(non_empty_lines) > 20 and has_description and has_installation and has_usage and has_sections:
+        if line_count > 20 and has_description and has_installation and has_usage and has_sections:
             return "verbose"
-        elif len(non_empty_lines) > 5:
+        elif line_count > 5:
             return "basic"
         else:
             return "minimal"
 
+def parse_port_mapping(port_mapping) -> Tuple[Optional[int], Optional[int]]:
+    """Split a Compose port mapping into (host port, container port).
+    
+    A bare port maps to itself; anything unrecognised gives (None, None).
+    """
+    if isinstance(port_mapping, int):
+        return port_mapping, port_mapping
+    match = PORT_MAPPING_RE.match(str(port_mapping))
+    if not match:
+        return None, None
+    host_port, container_port = match.groups()
+    container_port = int(container_port)
+    return (int(host_port) if host_port else container_port), container_port
+
 class DockerComposeParser:
+    @staticmethod
+    def parse_environment(environment) -> Dict[str, Any]:
+        """Normalize a service's environment, given as a mapping or as a list of "KEY=VALUE" strings."""
+        if isinstance(environment, list):
+            # A bare "KEY" takes its value from the host shell in Compose; there is none here
+            return dict(entry.partition('=')[::2] for entry in environment)
+        return environment or {}
+    
     @staticmethod
     def parse_compose_file(content: str) -> Dict[str, Any]:
         """Parse Docker Compose file and extract service information."""
         try:
-            compose_data = yaml.safe_load(content)
+            compose_data = yaml.load(content, Loader=SafeLoader)
             services = compose_data.get('services', {})
             
             parsed_services = []
@@ -136,33 +322,23 @@ class DockerComposeParser:
                     'image': service_config.get('image'),
                     'build': service_config.get('build'),
                     'ports': service_config.get('ports', []),
-                    'environment': service_config.get('environment', {}),
+                    'environment': DockerComposeParser.parse_environment(service_config.get('environment', {})),
                     'volumes': service_config.get('volumes', []),
                     'depends_on': service_config.get('depends_on', [])
                 }
                 
                 # Extract exposed ports
                 for port_mapping in service_config.get('ports', []):
-                    if isinstance(port_mapping, str):
-                        # Format: "host:container" or "port"
-                        if ':' in port_mapping:
-                            host_port = port_mapping.split(':')[0]
-                        else:
-                            host_port = port_mapping
-                        
-                        try:
-                            exposed_ports.append(int(host_port))
-                        except ValueError:
-                            pass
-                    elif isinstance(port_mapping, int):
-                        exposed_ports.append(port_mapping)
+                    host_port, _ = parse_port_mapping(port_mapping)
+                    if host_port is not None:
+                        exposed_ports.append(host_port)
                 
                 parsed_services.append(service_info)
             
             return {
                 'services': parsed_services,
                 'exposed_ports': list(set(exposed_ports)),
-                'has_web_interface': any(port in [80, 443, 3000, 8000, 8080, 5000, 4200] for port in exposed_ports)
+                'has_web_interface': not WEB_PORTS.isdisjoint(exposed_ports)
             }
             
         except yaml.YAMLError as e:
@@ -172,11 +348,11 @@ class DockerComposeParser:
 class KubernetesGenerator:
     def __init__(self, base_port: int = 30000):
         self.base_port = base_port
-        self.used_ports = set()
+        # Ports are only ever handed out, never released, so a cursor suffices
+        self._next_port = base_port
     
-    def generate_k8s_manifests(self, project: ProjectInfo, compose_content: str) -> Dict[str, str]:
-        """Generate Kubernetes manifests from Docker Compose."""
-        compose_data = DockerComposeParser.parse_compose_file(compose_content)
+    def generate_k8s_manifests(self, project: ProjectInfo, compose_data: Dict[str, Any]) -> Dict[str, str]:
+        """Generate Kubernetes manifests (as JSON, which kubectl reads natively) from parsed Docker Compose."""
         manifests = {}
         
         for service in compose_data['services']:
@@ -187,24 +363,25 @@ class KubernetesGenerator:
             
             # Generate Deployment
             deployment = self._generate_deployment(project.name, service)
-            manifests[f"{project.name}-{service['name']}-deployment.yaml"] = yaml.dump(deployment)
+            manifests[f"{project.name}-{service['name']}-deployment.json"] = json.dumps(deployment, indent=2)
             
             # Generate Service if ports are exposed
             if service['ports']:
                 service_manifest = self._generate_service(project.name, service)
-                manifests[f"{project.name}-{service['name']}-service.yaml"] = yaml.dump(service_manifest)
+                manifests[f"{project.name}-{service['name']}-service.json"] = json.dumps(service_manifest, indent=2)
         
         return manifests
     
     def _generate_deployment(self, project_name: str, service: Dict) -> Dict:
         """Generate Kubernetes Deployment manifest."""
+        app_name = f"{project_name}-{service['name']}"
         return {
             'apiVersion': 'apps/v1',
             'kind': 'Deployment',
             'metadata': {
-                'name': f"{project_name}-{service['name']}",
+                'name': app_name,
                 'labels': {
-                    'app': f"{project_name}-{service['name']}",
+                    'app': app_name,
                     'project': project_name
                 }
             },
@@ -212,13 +389,13 @@ class KubernetesGenerator:
                 'replicas': 1,
                 'selector': {
                     'matchLabels': {
-                        'app': f"{project_name}-{service['name']}"
+                        'app': app_name
                     }
                 },
                 'template': {
                     'metadata': {
                         'labels': {
-                            'app': f"{project_name}-{service['name']}"
+                            'app': app_name
                         }
                     },
                     'spec': {
@@ -237,6 +414,7 @@ class KubernetesGenerator:
     
     def _generate_service(self, project_name: str, service: Dict) -> Dict:
         """Generate Kubernetes Service manifest."""
+        app_name = f"{project_name}-{service['name']}"
         ports = []
         for port_mapping in service.get('ports', []):
             container_port = self._extract_container_port(port_mapping)
@@ -253,16 +431,16 @@ class KubernetesGenerator:
             'apiVersion': 'v1',
             'kind': 'Service',
             'metadata': {
-                'name': f"{project_name}-{service['name']}-service",
+                'name': f"{app_name}-service",
                 'labels': {
-                    'app': f"{project_name}-{service['name']}",
+                    'app': app_name,
                     'project': project_name
                 }
             },
             'spec': {
                 'type': 'NodePort',
                 'selector': {
-                    'app': f"{project_name}-{service['name']}"
+                    'app': app_name
                 },
                 'ports': ports
             }
@@ -270,29 +448,90 @@ class KubernetesGenerator:
     
     def _extract_container_port(self, port_mapping) -> int:
         """Extract container port from port mapping."""
-        if isinstance(port_mapping, int):
-            return port_mapping
-        elif isinstance(port_mapping, str):
-            if ':' in port_mapping:
-                return int(port_mapping.split(':')[1])
-            else:
-                return int(port_mapping)
-        return 8080  # default
+        _, container_port = parse_port_mapping(port_mapping)
+        return container_port if container_port is not None else 8080  # default
     
     def _get_available_port(self) -> int:
         """Get next available NodePort."""
-        port = self.base_port
-        while port in self.used_ports:
-            port += 1
-        self.used_ports.add(port)
+        port = self._next_port
+        self._next_port += 1
         return port
 
+async def analyze_repo(scanner: GitHubScanner, repo: Dict,
+                       files: Dict[str, Optional[str]]) -> Tuple[ProjectInfo, Dict[str, Any]]:
+    """Analyze one repository from its fetched files; returns its project info and parsed Docker Compose file."""
+    logger.info(f"Analyzing repository: {repo['name']}")
+    
+    # Only ask for the Pages URL when the repository listing says Pages is enabled
+    github_pages_url = None
+    if repo.get('has_pages'):
+        github_pages_url = await scanner.check_github_pages(repo['full_name'])
+    
+    compose_content = files['composeYml'] or files['composeYaml']
+    readme_content = files['readme'] or files['readmeLower']
+    
+    # Parse Docker Compose if exists
+    docker_info = {'services': [], 'exposed_ports': [], 'has_web_interface': False}
+    if compose_content:
+        docker_info = DockerComposeParser.parse_compose_file(compose_content)
+    
+    # Create project info
+    project = ProjectInfo(
+        name=repo['name'],
+        repo_url=repo['html_url'],
+        description=repo['description'] or '',
+        has_readme=bool(readme_content),
+        has_github_pages=bool(github_pages_url),
+        has_docker_compose=bool(compose_content),
+        has_web_interface=docker_info['has_web_interface'],
+        docker_services=[s['name'] for s in docker_info['services']],
+        exposed_ports=docker_info['exposed_ports'],
+        github_pages_url=github_pages_url,
+        readme_quality=scanner.analyze_readme(readme_content) if readme_content else "missing"
+    )
+    
+    # Validation flags
+    if not project.has_github_pages and project.readme_quality in ['missing', 'minimal'] and not project.has_web_interface:
+        project.validation_flags.append('missing_presentation')
+    
+    if project.has_docker_compose and not project.has_web_interface:
+        project.validation_flags.append('no_web_interface')
+    
+    if not project.has_readme:
+        project.validation_flags.append('no_readme')
+    
+    return project, docker_info
+
+async def scan_repositories(token: str, username: str = None,
+                            cache_path: Optional[str] = None) -> List[Tuple[ProjectInfo, Dict[str, Any]]]:
+    """Analyze all (non-fork) repositories concurrently, in repository order."""
+    async with GitHubScanner(token, username, cache_path) as scanner:
+        repos = [repo for repo in await scanner.get_user_repos() if not repo['fork']]  # Skip forked repositories
+        
+        # Fetch the Docker Compose files and READMEs of many repositories per query
+        batches = [repos[i:i + GRAPHQL_BATCH_SIZE] for i in range(0, len(repos), GRAPHQL_BATCH_SIZE)]
+        batch_files = await asyncio.gather(*(scanner.graphql_repos_metadata([repo['full_name'] for repo in batch])
+                                             for batch in batches))
+        files = [repo_files for batch in batch_files for repo_files in batch]
+        
+        analyzable = []
+        for repo, repo_files in zip(repos, files):
+            if repo_files is None:
+                logger.warning(f"Skipping repository {repo['name']}: its files could not be fetched")
+            else:
+                analyzable.append((repo, repo_files))
+        
+        return await asyncio.gather(*(analyze_repo(scanner, repo, repo_files)
+                                      for repo, repo_files in analyzable))
+
 def main():
     parser = argparse.ArgumentParser(description='Scan GitHub repositories for portfolio deployment')
     parser.add_argument('--github-token', required=True, help='GitHub API token')
     parser.add_argument('--cluster-host', required=True, help='Cluster host IP')
     parser.add_argument('--output-dir', default='./portfolio-output', help='Output directory')
     parser.add_argument('--username', help='GitHub username (optional)')
+    parser.add_argument('--cache-file', default='.portfolio-cache',
+                        help='ETag cache for GitHub API responses (empty to disable)')
     
     args = parser.parse_args()
     
@@ -300,87 +539,37 @@ def main():
     output_dir = Path(args.output_dir)
     output_dir.mkdir(exist_ok=True)
     
-    # Initialize scanner
-    scanner = GitHubScanner(args.github_token, args.username)
     k8s_generator = KubernetesGenerator()
     
     # Scan repositories
-    repos = scanner.get_user_repos()
+    results = asyncio.run(scan_repositories(args.github_token, args.username, args.cache_file))
     projects = []
     
-    for repo in repos:
-        if repo['fork']:  # Skip forked repositories
-            continue
-            
-        logger.info(f"Analyzing repository: {repo['name']}")
-        
-        # Check for Docker Compose file
-        compose_content = scanner.get_file_content(repo['full_name'], 'docker-compose.yml')
-        if not compose_content:
-            compose_content = scanner.get_file_content(repo['full_name'], 'docker-compose.yaml')
-        
-        # Check README
-        readme_content = scanner.get_file_content(repo['full_name'], 'README.md')
-        if not readme_content:
-            readme_content = scanner.get_file_content(repo['full_name'], 'readme.md')
-        
-        # Check GitHub Pages
-        github_pages_url = scanner.check_github_pages(repo['full_name'])
-        
-        # Parse Docker Compose if exists
-        docker_info = {'services': [], 'exposed_ports': [], 'has_web_interface': False}
-        if compose_content:
-            docker_info = DockerComposeParser.parse_compose_file(compose_content)
-        
-        # Create project info
-        project = ProjectInfo(
-            name=repo['name'],
-            repo_url=repo['html_url'],
-            description=repo['description'] or '',
-            has_readme=bool(readme_content),
-            has_github_pages=bool(github_pages_url),
-            has_docker_compose=bool(compose_content),
-            has_web_interface=docker_info['has_web_interface'],
-            docker_services=[s['name'] for s in docker_info['services']],
-            exposed_ports=docker_info['exposed_ports'],
-            github_pages_url=github_pages_url,
-            readme_quality=scanner.analyze_readme(readme_content) if readme_content else "missing"
-        )
-        
-        # Validation flags
-        if not project.has_github_pages and project.readme_quality in ['missing', 'minimal'] and not project.has_web_interface:
-            project.validation_flags.append('missing_presentation')
-        
-        if project.has_docker_compose and not project.has_web_interface:
-            project.validation_flags.append('no_web_interface')
-        
-        if not project.has_readme:
-            project.validation_flags.append('no_readme')
-        
+    for project, docker_info in results:
         projects.append(project)
         
         # Generate Kubernetes manifests if Docker Compose exists
-        if compose_content and docker_info['services']:
-            manifests = k8s_generator.generate_k8s_manifests(project, compose_content)
+        if docker_info['services']:
+            manifests = k8s_generator.generate_k8s_manifests(project, docker_info)
             
-            # Save manifests
+            # Save all of the project's manifests as one multi-document file.
+            # The leading --- makes kubectl read it as a YAML stream (of JSON
+            # documents) rather than as a single JSON object.
             project_dir = output_dir / project.name
             project_dir.mkdir(exist_ok=True)
-            
-            for filename, content in manifests.items():
-                (project_dir / filename).write_text(content)
+            (project_dir / f"{project.name}.yaml").write_text('---\n' + '\n---\n'.join(manifests.values()))
     
-    # Save portfolio data
+    # Save portfolio data; orjson serializes the ProjectInfo dataclasses directly
     portfolio_data = {
-        'projects': [asdict(p) for p in projects],
-        'scan_timestamp': datetime.now().isoformat(),
+        'projects': projects,
+        'scan_timestamp': datetime.now(timezone.utc).isoformat(),
         'total_projects': len(projects),
         'projects_with_docker': len([p for p in projects if p.has_docker_compose]),
         'projects_with_web_interface': len([p for p in projects if p.has_web_interface]),
         'flagged_projects': len([p for p in projects if p.validation_flags])
     }
     
-    (output_dir / 'portfolio.json').write_text(json.dumps(portfolio_data, indent=2))
+    (output_dir / 'portfolio.json').write_bytes(orjson.dumps(portfolio_data, option=orjson.OPT_INDENT_2))
     
     logger.info(f"Portfolio scan complete. Found {len(projects)} projects.")
     logger.info(f"Projects with Docker Compose: {portfolio_data['projects_with_docker']}")
@@ -61,7 +61,7 @@ def test_kubernetes_generator():
     print("\n🧪 Testing Kubernetes Generator...")
     
     sys.path.append(str(Path(__file__).parent))
-    from portfolio_scanner import KubernetesGenerator, ProjectInfo
+    from portfolio_scanner import DockerComposeParser, KubernetesGenerator, ProjectInfo
     
     # Create test project
     project = ProjectInfo(
@@ -77,7 +77,8 @@ def test_kubernetes_generator():
     )
     
     generator = KubernetesGenerator()
-    manifests = generator.generate_k8s_manifests(project, create_test_docker_compose())
+    compose_data = DockerComposeParser.parse_compose_file(create_test_docker_compose())
+    manifests = generator.generate_k8s_manifests(project, compose_data)
     
     print(f"✅ Generated {len(manifests)} manifests")
     for filename in manifests.keys():
@@ -6,41 +6,82 @@ Portfolio Status Updater - Updates portfolio status and monitors deployments
 
 import os
 import sys
-import json
+import orjson
+import asyncio
 import subprocess
 import argparse
 from pathlib import Path
 import logging
+from datetime import datetime, timezone
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# One tab-separated line per deployment/service:
+# kind, name, spec replicas, ready replicas, service type, node ports
+STATUS_JSONPATH = ('{range .items[*]}{.kind}{"\\t"}{.metadata.name}{"\\t"}{.spec.replicas}{"\\t"}'
+                   '{.status.readyReplicas}{"\\t"}{.spec.type}{"\\t"}{.spec.ports[*].nodePort}{"\\n"}{end}')
+
 class StatusUpdater:
     def __init__(self, cluster_host: str, ssh_key_path: str):
         self.cluster_host = cluster_host
         self.ssh_key_path = ssh_key_path
         self.ssh_user = "ansible"
+        # All ssh calls share one authenticated connection through an
+        # OpenSSH ControlMaster, instead of a handshake per command
+        self.control_path = f'/tmp/ssh-portfolio-status-{os.getpid()}.sock'
+        self.ssh_options = [
+            '-i', self.ssh_key_path,
+            '-o', 'StrictHostKeyChecking=no',
+            '-o', f'ControlPath={self.control_path}'
+        ]
+        self._start_master()
+    
+    @property
+    def remote(self) -> str:
+        return f'{self.ssh_user}@{self.cluster_host}'
+    
+    def _start_master(self):
+        """Open the shared master connection (ssh falls back to direct connections if this fails)."""
+        master_cmd = [
+            'ssh', *self.ssh_options,
+            '-o', 'ControlMaster=yes',
+            '-o', 'ControlPersist=60',
+            '-M', '-N', '-f',
+            self.remote
+        ]
+        
+        result = subprocess.run(master_cmd, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                                stderr=subprocess.PIPE, text=True)
+        if result.returncode != 0:
+            logger.warning(f"Could not open shared SSH connection: {result.stderr.strip()}")
+    
+    def close(self):
+        """Shut down the shared master connection."""
+        subprocess.run(['ssh', '-o', f'ControlPath={self.control_path}', '-O', 'exit', self.remote],
+                       stdin=subprocess.DEVNULL, capture_output=True)
     
-    def execute_remote_command(self, command: str) -> tuple:
+    async def execute_remote_command(self, command: str) -> tuple:
         """Execute command on remote cluster."""
         ssh_cmd = [
-            'ssh', '-i', self.ssh_key_path, 
-            '-o', 'StrictHostKeyChecking=no',
-            f'{self.ssh_user}@{self.cluster_host}',
+            'ssh', *self.ssh_options,
+            self.remote,
             command
         ]
         
-        try:
-            result = subprocess.run(ssh_cmd, capture_output=True, text=True, check=True)
-            return result.returncode, result.stdout, result.stderr
-        except subprocess.CalledProcessError as e:
-            return e.returncode, e.stdout, e.stderr
+        process = await asyncio.create_subprocess_exec(
+            *ssh_cmd, stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        )
+        stdout, stderr = await process.communicate()
+        return process.returncode, stdout.decode(), stderr.decode()
     
-    def get_deployment_status(self) -> dict:
+    async def get_deployment_status(self) -> dict:
         """Get status of all portfolio deployments."""
-        # Get deployments
-        returncode, stdout, stderr = self.execute_remote_command(
-            "kubectl get deployments -o json"
+        # Get deployments and services in one call, asking kubectl for just
+        # the fields we use rather than the full JSON objects
+        returncode, stdout, stderr = await self.execute_remote_command(
+            f"kubectl get deployments,services -o jsonpath='{STATUS_JSONPATH}'"
         )
         
         status = {
@@ -50,35 +91,26 @@ class StatusUpdater:
             'portfolio_url': f"http://{self.cluster_host}:30080"
         }
         
-        if returncode == 0:
-            import json
-            deployments = json.loads(stdout)
+        if returncode != 0:
+            return status
+        
+        for line in stdout.splitlines():
+            kind, name, spec_replicas, ready_replicas, service_type, node_ports = line.split('\t')
             
-            for deployment in deployments.get('items', []):
-                name = deployment['metadata']['name']
-                spec_replicas = deployment['spec']['replicas']
-                ready_replicas = deployment['status'].get('readyReplicas', 0)
+            if kind == 'Deployment':
+                spec_replicas = int(spec_replicas or 0)
+                ready_replicas = int(ready_replicas or 0)
                 
                 status['deployments'][name] = {
                     'ready': ready_replicas == spec_replicas,
                     'replicas': f"{ready_replicas}/{spec_replicas}"
                 }
-        
-        # Get services
-        returncode, stdout, stderr = self.execute_remote_command(
-            "kubectl get services -o json"
-        )
-        
-        if returncode == 0:
-            services = json.loads(stdout)
             
-            for service in services.get('items', []):
-                name = service['metadata']['name']
-                service_type = service['spec'].get('type', 'ClusterIP')
+            elif kind == 'Service':
+                service_type = service_type or 'ClusterIP'
                 
                 if service_type == 'NodePort':
-                    ports = service['spec'].get('ports', [])
-                    node_ports = [p.get('nodePort') for p in ports if p.get('nodePort')]
+                    node_ports = [int(port) for port in node_ports.split()]
                     
                     status['services'][name] = {
                         'type': service_type,
@@ -88,33 +120,36 @@ class StatusUpdater:
         
         return status
     
-    def check_portfolio_health(self) -> dict:
-        """Check health of portfolio system."""
-        health = {
-            'portfolio_accessible': False,
-            'kubernetes_healthy': False,
-            'total_projects': 0,
-            'running_projects': 0
-        }
-        
-        # Check if portfolio is accessible
-        returncode, stdout, stderr = self.execute_remote_command(
+    async def check_portfolio_accessible(self) -> bool:
+        """Check if the portfolio answers on its NodePort."""
+        returncode, stdout, stderr = await self.execute_remote_command(
             f"curl -s -o /dev/null -w '%{{http_code}}' http://localhost:30080"
         )
+        return returncode == 0 and stdout.strip() == '200'
+    
+    async def check_kubernetes_healthy(self) -> bool:
+        """Check if the Kubernetes API answers."""
+        returncode, stdout, stderr = await self.execute_remote_command("kubectl get nodes")
+        return returncode == 0
+    
+    async def check_portfolio_health(self) -> tuple:
+        """Get deployment status and health of portfolio system, as (status, health)."""
+        # The remote calls are independent; run them concurrently over the
+        # shared connection
+        status, portfolio_accessible, kubernetes_healthy = await asyncio.gather(
+            self.get_deployment_status(),
+            self.check_portfolio_accessible(),
+            self.check_kubernetes_healthy()
+        )
         
-        if returncode == 0 and stdout.strip() == '200':
-            health['portfolio_accessible'] = True
-        
-        # Check Kubernetes health
-        returncode, stdout, stderr = self.execute_remote_command("kubectl get nodes")
-        health['kubernetes_healthy'] = returncode == 0
-        
-        # Count deployments
-        status = self.get_deployment_status()
-        health['total_projects'] = len(status['deployments'])
-        health['running_projects'] = sum(1 for d in status['deployments'].values() if d['ready'])
+        health = {
+            'portfolio_accessible': portfolio_accessible,
+            'kubernetes_healthy': kubernetes_healthy,
+            'total_projects': len(status['deployments']),
+            'running_projects': sum(1 for d in status['deployments'].values() if d['ready'])
+        }
         
-        return health
+        return status, health
 
 def main():
     parser = argparse.ArgumentParser(description='Update portfolio status')
@@ -124,41 +159,42 @@ def main():
     args = parser.parse_args()
     
     updater = StatusUpdater(args.cluster_host, args.ssh_key)
-    
-    # Get deployment status
-    status = updater.get_deployment_status()
-    health = updater.check_portfolio_health()
-    
-    # Log status
-    logger.info("=== Portfolio Status ===")
-    logger.info(f"Portfolio URL: {status['portfolio_url']}")
-    logger.info(f"Portfolio accessible: {health['portfolio_accessible']}")
-    logger.info(f"Kubernetes healthy: {health['kubernetes_healthy']}")
-    logger.info(f"Projects: {health['running_projects']}/{health['total_projects']} running")
-    
-    logger.info("\n=== Deployment Status ===")
-    for name, deploy_status in status['deployments'].items():
-        status_icon = "✅" if deploy_status['ready'] else "❌"
-        logger.info(f"{status_icon} {name}: {deploy_status['replicas']}")
-    
-    logger.info("\n=== Service URLs ===")
-    for name, service in status['services'].items():
-        for url in service['urls']:
-            logger.info(f"🌐 {name}: {url}")
-    
-    # Save status to file for GitHub Actions
-    status_data = {
-        'status': status,
-        'health': health,
-        'timestamp': str(__import__('datetime').datetime.now())
-    }
-    
-    with open('portfolio-status.json', 'w') as f:
-        json.dump(status_data, f, indent=2)
-    
-    # Exit with error code if not healthy
-    if not health['kubernetes_healthy'] or not health['portfolio_accessible']:
-        sys.exit(1)
+    try:
+        # Get deployment status and health
+        status, health = asyncio.run(updater.check_portfolio_health())
+        
+        # Log status
+        logger.info("=== Portfolio Status ===")
+        logger.info(f"Portfolio URL: {status['portfolio_url']}")
+        logger.info(f"Portfolio accessible: {health['portfolio_accessible']}")
+        logger.info(f"Kubernetes healthy: {health['kubernetes_healthy']}")
+        logger.info(f"Projects: {health['running_projects']}/{health['total_projects']} running")
+        
+        logger.info("\n=== Deployment Status ===")
+        for name, deploy_status in status['deployments'].items():
+            status_icon = "✅" if deploy_status['ready'] else "❌"
+            logger.info(f"{status_icon} {name}: {deploy_status['replicas']}")
+        
+        logger.info("\n=== Service URLs ===")
+        for name, service in status['services'].items():
+            for url in service['urls']:
+                logger.info(f"🌐 {name}: {url}")
+        
+        # Save status to file for GitHub Actions
+        status_data = {
+            'status': status,
+            'health': health,
+            'timestamp': datetime.now(timezone.utc).isoformat()
+        }
+        
+        with open('portfolio-status.json', 'wb') as f:
+            f.write(orjson.dumps(status_data, option=orjson.OPT_INDENT_2))
+        
+        # Exit with error code if not healthy
+        if not health['kubernetes_healthy'] or not health['portfolio_accessible']:
+            sys.exit(1)
+    finally:
+        updater.close()
 
 if __name__ == '__main__':
     main()
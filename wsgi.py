@@ -0,0 +1,15 @@
+#!/usr/bin/env python3
+"""
+WSGI entry point for the OddJobCluster Dashboard
+
+Run under gunicorn rather than Flask's development server:
+    gunicorn -k gthread -w 1 --threads 8 -b 0.0.0.0:8080 wsgi:app
+
+Each worker process polls SLURM/Kubernetes in its own background refresher,
+so scale with threads rather than extra workers.
+"""
+
+from cluster_dashboard import app
+
+if __name__ == '__main__':
+    app.run(host='0.0.0.0', port=8080, debug=False)